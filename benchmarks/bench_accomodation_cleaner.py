@@ -0,0 +1,96 @@
+"""
+Benchmark: vectorized accommodation cleaning vs. the per-row `.apply` path.
+
+Generates synthetic InsideAirbnb-style listings, cleans prices and bathrooms
+both ways, checks that the results are identical, and reports timings.
+
+    python -m benchmarks.bench_accomodation_cleaner --rows 200000
+"""
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from src.utils.accomodation_cleaner import (
+    clean_currency,
+    clean_currency_column,
+    parse_bathrooms,
+    process_bathroom_counts,
+)
+
+BATHROOM_TEXTS = [
+    "1 bath", "1.5 baths", "2 shared baths", "Half-bath", "Shared half-bath",
+    "1 private bath", "0 baths", "3.5 shared bathrooms", None
+]
+DESCRIPTIONS = [
+    "Bright flat with a shared bathroom on the landing.",
+    "Cozy studio near the Duomo.",
+    "Room with shared  half bath and fast wifi.",
+    "Lovely apartment, shared",
+    None
+]
+NAMES = ["Sunny loft", "Room w/ Shared Bath", "Central studio", None]
+PROPERTY_TYPES = ["Entire rental unit", "Private room in home", "Shared room", None]
+
+def make_listings(n_rows, seed=0):
+    rng = np.random.default_rng(seed)
+    prices = rng.integers(20, 5000, size=n_rows)
+    return pd.DataFrame({
+        "price": [f"${p:,}.00" if i % 17 else np.nan for i, p in enumerate(prices)],
+        "bathrooms": np.where(rng.random(n_rows) < 0.7, np.nan, rng.integers(1, 4, size=n_rows)),
+        "bathrooms_text": rng.choice(np.array(BATHROOM_TEXTS, dtype=object), size=n_rows),
+        "description": rng.choice(np.array(DESCRIPTIONS, dtype=object), size=n_rows),
+        "name": rng.choice(np.array(NAMES, dtype=object), size=n_rows),
+        "property_type": rng.choice(np.array(PROPERTY_TYPES, dtype=object), size=n_rows),
+    })
+
+def apply_bathroom_counts(df):
+    """The previous implementation: per-row `.apply` and one `str.contains` pass per column."""
+    df = df.copy()
+    mask = df['bathrooms'].isna()
+    df.loc[mask, 'bathrooms'] = df.loc[mask, 'bathrooms_text'].apply(parse_bathrooms)
+
+    bathroom_pattern = r'shared\s+(?:half[-\s]?bath|bathroom|bath)'
+    shared_from_text = df['bathrooms_text'].str.contains(bathroom_pattern, case=False, na=False)
+    fallback_mask = df['bathrooms_text'].isna()
+    shared_fallback = (
+        df['description'].str.contains(bathroom_pattern, case=False, na=False, regex=True)
+        | df['name'].str.contains(bathroom_pattern, case=False, na=False, regex=True)
+        | df['property_type'].str.contains(bathroom_pattern, case=False, na=False, regex=True)
+    )
+
+    df['bathroom_shared'] = pd.Series(pd.NA, dtype='boolean')
+    df.loc[shared_from_text, 'bathroom_shared'] = True
+    df.loc[fallback_mask & shared_fallback, 'bathroom_shared'] = True
+    df.loc[df['bathrooms_text'].notna() & ~shared_from_text, 'bathroom_shared'] = False
+    return df
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the accommodation cleaner")
+    parser.add_argument("--rows", type=int, default=100_000)
+    args = parser.parse_args()
+
+    listings = make_listings(args.rows)
+
+    apply_prices, apply_price_time = timed(lambda s: s.apply(clean_currency), listings['price'])
+    vector_prices, vector_price_time = timed(clean_currency_column, listings['price'])
+    pd.testing.assert_series_equal(apply_prices, vector_prices)
+
+    # process_bathroom_counts works in place, so give it its own copy
+    apply_baths, apply_bath_time = timed(apply_bathroom_counts, listings)
+    vector_baths, vector_bath_time = timed(process_bathroom_counts, listings.copy(deep=True))
+    pd.testing.assert_frame_equal(apply_baths, vector_baths)
+
+    print(f"{args.rows:,} synthetic listings: outputs match.")
+    print(f"price     : apply {apply_price_time:6.3f}s  vectorized {vector_price_time:6.3f}s")
+    print(f"bathrooms : apply {apply_bath_time:6.3f}s  vectorized {vector_bath_time:6.3f}s")
+
+if __name__ == "__main__":
+    main()
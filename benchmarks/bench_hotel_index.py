@@ -0,0 +1,150 @@
+"""
+Benchmark: embedded NumPy hotel index vs. the Chroma collection.
+
+Builds a synthetic listings collection in Chroma, exports it to a NumPy index,
+then runs the same filtered queries against both backends, each in its own
+process. Reports per-query latency, recall@k against exact search and peak RSS.
+
+    OPENAI_API_KEY=x TAVILY_API_KEY=x python -m benchmarks.bench_hotel_index --listings 20000
+"""
+
+import argparse
+import multiprocessing as mp
+from concurrent.futures import ProcessPoolExecutor
+import resource
+import tempfile
+import time
+
+import numpy as np
+
+CITIES = ["Tokyo", "Kyoto", "Osaka"]
+
+def make_listings(n_listings, dim, seed=0):
+    rng = np.random.default_rng(seed)
+    embeddings = rng.standard_normal((n_listings, dim)).astype(np.float32)
+    embeddings /= np.linalg.norm(embeddings, axis=1, keepdims=True)
+    prices = rng.uniform(30, 600, size=n_listings).round(2)
+    metadatas = [
+        {
+            "price": float(prices[i]),
+            "url": f"https://example.com/rooms/{i}",
+            "id": str(i),
+            "bedrooms": int(rng.integers(1, 5)),
+            "neighbourhood": f"Ward {i % 23}",
+            "city": CITIES[i % len(CITIES)],
+            "content_hash": str(i)
+        }
+        for i in range(n_listings)
+    ]
+    documents = [f"Listing {i} in {m['city']}, {m['neighbourhood']}" for i, m in enumerate(metadatas)]
+    return embeddings, metadatas, documents
+
+def make_requests(n_queries, dim, seed=1):
+    rng = np.random.default_rng(seed)
+    queries = rng.standard_normal((n_queries, dim)).astype(np.float32)
+    queries /= np.linalg.norm(queries, axis=1, keepdims=True)
+    requests = [
+        (CITIES[i % len(CITIES)], f"query {i}", float(rng.choice([80, 150, 300])))
+        for i in range(n_queries)
+    ]
+    return queries, requests
+
+def exact_top_k(embeddings, metadatas, queries, requests, k):
+    prices = np.array([m["price"] for m in metadatas])
+    cities = np.array([m["city"] for m in metadatas])
+    truth = []
+    for query, (city, _, max_price) in zip(queries, requests):
+        rows = np.flatnonzero((prices <= max_price) & (cities == city))
+        distances = ((embeddings[rows] - query) ** 2).sum(axis=1)
+        truth.append({str(rows[i]) for i in np.argsort(distances)[:k]})
+    return truth
+
+def peak_rss_mb():
+    # VmHWM is per address space; ru_maxrss would carry over the parent's peak across fork/exec
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+def run_backend(backend, chroma_path, numpy_path, queries, requests, k):
+    if backend == "chroma":
+        from src.tools.hotel_rag.hotel_index import HotelIndex
+        index = HotelIndex(path=chroma_path, collection_name="bench_listings")
+    else:
+        from src.tools.hotel_rag.numpy_index import NumpyHotelIndex
+        index = NumpyHotelIndex(path=numpy_path)
+
+    start = time.perf_counter()
+    index.warm_up()
+    load_time = time.perf_counter() - start
+
+    latencies, found = [], []
+    for query, request in zip(queries, requests):
+        start = time.perf_counter()
+        result = index.search_batch([query.tolist()], [request], n_results=k)[0]
+        latencies.append(time.perf_counter() - start)
+        found.append({hotel["id"] for hotel in result["hotels"]})
+
+    return {
+        "load": load_time,
+        "latencies": latencies,
+        "found": found,
+        "rss_mb": peak_rss_mb()
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="NumPy vs Chroma hotel index benchmark")
+    parser.add_argument("--listings", type=int, default=20000)
+    parser.add_argument("--dim", type=int, default=1536)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=3)
+    parser.add_argument("--dtype", choices=["float16", "float32"], default="float16")
+    args = parser.parse_args()
+
+    import chromadb
+    from src.tools.hotel_rag.build_index import openai_ef
+    from src.tools.hotel_rag.numpy_index import export_from_chroma
+
+    embeddings, metadatas, documents = make_listings(args.listings, args.dim)
+    queries, requests = make_requests(args.queries, args.dim)
+    truth = exact_top_k(embeddings, metadatas, queries, requests, args.k)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        chroma_path = f"{tmp}/chroma"
+        numpy_path = f"{tmp}/numpy"
+
+        collection = chromadb.PersistentClient(path=chroma_path).create_collection(
+            "bench_listings", embedding_function=openai_ef
+        )
+        for start in range(0, args.listings, 5000):
+            stop = start + 5000
+            collection.add(
+                ids=[str(i) for i in range(start, min(stop, args.listings))],
+                embeddings=embeddings[start:stop].tolist(),
+                metadatas=metadatas[start:stop],
+                documents=documents[start:stop]
+            )
+        export_from_chroma(collection, numpy_path, dtype=args.dtype)
+
+        print(f"{args.listings} listings x {args.dim} dims, {args.queries} queries, k={args.k}")
+        for backend in ("chroma", "numpy"):
+            # A fresh process per backend, so peak RSS isn't shared between them
+            with ProcessPoolExecutor(max_workers=1, mp_context=mp.get_context("spawn")) as pool:
+                result = pool.submit(
+                    run_backend, backend, chroma_path, numpy_path, queries, requests, args.k
+                ).result()
+
+            latencies = np.array(result["latencies"]) * 1000
+            recall = np.mean([len(found & exact) / max(len(exact), 1) for found, exact in zip(result["found"], truth)])
+            print(
+                f"{backend:>6}: load {result['load']:.2f}s | "
+                f"p50 {np.percentile(latencies, 50):.2f}ms p95 {np.percentile(latencies, 95):.2f}ms | "
+                f"recall@{args.k} {recall:.3f} | peak RSS {result['rss_mb']:.0f}MB"
+            )
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Benchmark: streaming top-k review selection vs. the in-memory sort/groupby path.
+
+Generates a synthetic reviews CSV, runs both selectors on it, checks that they
+pick the same reviews, and reports wall time and peak Python memory.
+
+No API calls are made, but importing the summarizer creates its OpenAI
+client, so `OPENAI_API_KEY` must be set; any placeholder works:
+
+    OPENAI_API_KEY=x python -m benchmarks.bench_review_selection --listings 20000 --reviews-per-listing 60
+"""
+
+import argparse
+import os
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from src.utils.review_summarizer import group_recent_reviews, stream_recent_reviews
+
+def make_reviews(path, n_listings, reviews_per_listing, seed=0):
+    rng = np.random.default_rng(seed)
+    n_reviews = n_listings * reviews_per_listing
+    listing_ids = rng.integers(1, n_listings + 1, size=n_reviews)
+    # Unique timestamps, so both selectors have a single correct answer
+    dates = pd.Timestamp("2015-01-01") + pd.to_timedelta(rng.permutation(n_reviews), unit="min")
+    reviews = pd.DataFrame({
+        "listing_id": listing_ids,
+        "id": np.arange(n_reviews),
+        "date": dates.strftime("%Y-%m-%d %H:%M"),
+        "reviewer_name": "guest",
+        "comments": [f"Review {i}: lovely stay, quiet street, close to the Duomo." for i in range(n_reviews)]
+    })
+    reviews.to_csv(path, index=False)
+
+def measure(func, *args, **kwargs):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark top-k review selection")
+    parser.add_argument("--listings", type=int, default=5000)
+    parser.add_argument("--reviews-per-listing", type=int, default=40)
+    parser.add_argument("--chunksize", type=int, default=20_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "reviews.csv")
+        make_reviews(path, args.listings, args.reviews_per_listing)
+        size_mb = os.path.getsize(path) / 1e6
+        print(f"Synthetic reviews: {args.listings * args.reviews_per_listing:,} rows, {size_mb:.1f} MB")
+
+        baseline, base_time, base_peak = measure(lambda: group_recent_reviews(pd.read_csv(path)))
+        streamed, stream_time, stream_peak = measure(stream_recent_reviews, path, chunksize=args.chunksize)
+
+    pd.testing.assert_frame_equal(
+        baseline.reset_index(drop=True), streamed.reset_index(drop=True), check_dtype=False
+    )
+    print("Outputs match.")
+    print(f"sort/groupby : {base_time:6.2f}s  peak {base_peak / 1e6:8.1f} MB")
+    print(f"streaming    : {stream_time:6.2f}s  peak {stream_peak / 1e6:8.1f} MB")
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,26 @@
 # src/agents/accountant.py
 from src.state import TravelState
+from src.utils.configs import MAX_REPLAN_ATTEMPTS
 
 def route_after_budget_check(state: TravelState) -> str:
     # It just READS the state and returns a string signal
-    if state["total_cost"] <= state["budget"]:
+    # (the budget check also rejects plans with a city left without a stay)
+    if state["status"] == "within_budget":
         return "success"
-    else:
-        return "recalculate"
\ No newline at end of file
+    # Unachievable budgets would otherwise loop forever: stop after the cap,
+    # or as soon as re-querying can't make the trip cheaper
+    if state.get("budget_checks", 1) > MAX_REPLAN_ATTEMPTS or not state.get("replan_target"):
+        return "give_up"
+    return "recalculate"
+
+def route_after_cost_gate(state: TravelState) -> str:
+    # Flights and hotels are in: keep going, re-query stays, or stop here
+    if state["status"] != "over_budget":
+        return "continue"
+    if state.get("budget_checks", 1) > MAX_REPLAN_ATTEMPTS or not state.get("replan_target"):
+        return "fail"
+    return "replan"
+
+def route_after_replan(state: TravelState) -> str:
+    # A replan from the cost gate happens before activities have been searched
+    return "optimize" if state.get("activity_info") else "gate"
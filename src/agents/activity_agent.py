@@ -1,22 +1,43 @@
 from src.state import TravelState
-from src.tools.activity_tool import search_activities
+from src.tools.activity_tool import search_activities, asearch_activities
+from src.utils.concurrency import map_in_order, amap_in_order
+from src.utils.configs import MAX_CITY_CONCURRENCY
+
+# Mocked per-city activity budget (also the estimate used before activities are searched)
+ACTIVITY_COST_PER_CITY = 50.0
+
+def _city_activities(city, results):
+    return {
+        "location": city,
+        "total_cost": ACTIVITY_COST_PER_CITY,
+        "details": results
+    }
 
 def activity_agent(state: TravelState):
     print("--- 🎡 AGENT: ACTIVITY SCOUT ---")
     
-    all_activities = []
-    
-    for city in state["destinations"]:
+    def search_city(city):
         print(f"Finding things to do in {city}...")
-        results = search_activities(city, state["request"])
-        
-        all_activities.append({
-            "location": city,
-            "total_cost": 50.0, # Mocked per-city activity budget
-            "details": results
-        })
+        return _city_activities(city, search_activities(city, state["request"]))
+
+    # Every city is searched concurrently; results stay in destination order
+    all_activities = map_in_order(search_city, state["destinations"], MAX_CITY_CONCURRENCY)
         
     return {
         "activity_info": all_activities,
         "status": "activities_found"
-    }
\ No newline at end of file
+    }
+
+async def aactivity_agent(state: TravelState):
+    print("--- 🎡 AGENT: ACTIVITY SCOUT ---")
+
+    async def search_city(city):
+        print(f"Finding things to do in {city}...")
+        return _city_activities(city, await asearch_activities(city, state["request"]))
+
+    all_activities = await amap_in_order(search_city, state["destinations"], MAX_CITY_CONCURRENCY)
+
+    return {
+        "activity_info": all_activities,
+        "status": "activities_found"
+    }
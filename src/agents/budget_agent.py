@@ -1,22 +1,171 @@
 from src.state import TravelState
+from src.agents.activity_agent import ACTIVITY_COST_PER_CITY
+from src.utils.configs import HOTEL_BUDGET_SHARE
+
+def stays_without_candidates(state: TravelState):
+    """
+    Cities whose hotel search found nothing within the cap. These stays have
+    no price, so they're left out of the cost sums and flagged instead.
+    """
+    return [stay["location"] for stay in state.get("hotel_info", []) if not stay.get("candidates")]
+
+def component_costs(state: TravelState):
+    """
+    Cost of each part of the trip, keyed by the node that produced it.
+    Unresolved stays (see `stays_without_candidates`) add nothing.
+    """
+    return {
+        # 1. Get Flight Cost
+        "flights": state.get("flight_info", {}).get("total_price", 0),
+        # 2. Sum Hotel Costs (List)
+        "hotels": sum(hotel["price"] for hotel in state.get("hotel_info", []) if hotel.get("candidates")),
+        # 3. Sum Activity Costs (List)
+        "activities": sum(act["total_cost"] for act in state.get("activity_info", []))
+    }
+
+def committed_costs(state: TravelState):
+    """
+    Cheapest cost each component can still reach with the candidates already
+    found: the cheapest flight option, the cheapest candidate per stay, and
+    the activity estimate for cities not searched yet.
+    """
+    flight_info = state.get("flight_info") or {}
+    flight_prices = [option["total_price"] for option in flight_info.get("options") or []]
+    activity_info = state.get("activity_info") or []
+    return {
+        "flights": min(flight_prices) if flight_prices else flight_info.get("total_price", 0),
+        "hotels": sum(
+            min(c["total_price"] for c in stay["candidates"])
+            for stay in state.get("hotel_info", []) if stay.get("candidates")
+        ),
+        "activities": (
+            sum(act["total_cost"] for act in activity_info) if activity_info
+            else ACTIVITY_COST_PER_CITY * len(state.get("destinations", []))
+        )
+    }
+
+def _plan_rank(missing_stays, total_cost):
+    # Plans compare on unresolved cities first, then cost: a complete plan
+    # always beats a cheaper one that is missing a stay
+    return (len(missing_stays), total_cost)
+
+def _replan_target(state: TravelState, costs, missing, previous_best):
+    """
+    Picks the component to re-query: hotels when a city has no stay yet,
+    otherwise the one furthest over its share of the budget. Activities are
+    priced from a fixed per-city estimate, so only flights and hotels can get
+    cheaper. Returns None when a re-query can't help.
+    """
+    budget = state["budget"]
+    hotel_share = budget * HOTEL_BUDGET_SHARE
+    overshoot = {
+        "hotels": costs["hotels"] - hotel_share,
+        "flights": costs["flights"] - (budget - hotel_share - costs["activities"])
+    }
+    # The optimizer already weighed every flight option: once the cheapest is
+    # selected, re-querying flights can't help, but tighter hotel caps still can
+    flight_options = state.get("flight_info", {}).get("options") or []
+    if flight_options and costs["flights"] <= min(option["total_price"] for option in flight_options):
+        overshoot.pop("flights")
+    target = "hotels" if missing else max(overshoot, key=overshoot.get)
+
+    # Nothing left for the target once the other components are paid for
+    if budget - (sum(costs.values()) - costs[target]) <= 0:
+        return None
+    # The last re-query didn't improve the plan: another one won't either
+    if previous_best and _plan_rank(missing, sum(costs.values())) >= _plan_rank(
+        previous_best.get("missing_stays", []), previous_best["total_cost"]
+    ):
+        return None
+    return target
 
 def budget_agent(state: TravelState):
     print("--- 💰 AGENT: BUDGET CHECK ---")
     
-    # 1. Get Flight Cost
-    f_cost = state["flight_info"].get("total_price", 0)
-    
-    # 2. Sum Hotel Costs (List)
-    h_cost = sum(hotel["price"] for hotel in state["hotel_info"])
-    
-    # 3. Sum Activity Costs (List)
-    a_cost = sum(act["total_cost"] for act in state["activity_info"])
-    
-    grand_total = f_cost + h_cost + a_cost
+    costs = component_costs(state)
+    grand_total = sum(costs.values())
+
+    # A city without a stay can't be priced, so the plan can't count as within budget
+    missing = stays_without_candidates(state)
+    if missing:
+        print(f"No stay found in {', '.join(missing)} within the cap.")
     
-    status = "within_budget" if grand_total <= state["budget"] else "over_budget"
+    status = "within_budget" if grand_total <= state["budget"] and not missing else "over_budget"
+
+    # Keep the best plan seen (fewest missing stays, then cheapest), so a capped
+    # replan can fall back to it
+    previous_best = state.get("best_plan")
+    best_plan = previous_best
+    if not previous_best or _plan_rank(missing, grand_total) < _plan_rank(
+        previous_best.get("missing_stays", []), previous_best["total_cost"]
+    ):
+        best_plan = {
+            "flight_info": state.get("flight_info"),
+            "hotel_info": state.get("hotel_info"),
+            "activity_info": state.get("activity_info"),
+            "total_cost": grand_total,
+            "missing_stays": missing
+        }
     
     return {
         "total_cost": grand_total,
-        "status": status
-    }
\ No newline at end of file
+        "status": status,
+        "budget_checks": state.get("budget_checks", 0) + 1,
+        "replan_target": _replan_target(state, costs, missing, previous_best) if status == "over_budget" else None,
+        "best_plan": best_plan,
+        "missing_stays": missing
+    }
+
+def cost_gate_agent(state: TravelState):
+    """
+    Running-cost check between the flight/hotel searches and the activity
+    search. If even the cheapest flight and stays already break the budget,
+    the request is replanned (hotels) or failed fast, before any more searching.
+    """
+    print("--- 🚧 AGENT: COST GATE ---")
+
+    committed = committed_costs(state)
+    lower_bound = sum(committed.values())
+    missing = stays_without_candidates(state)
+    if lower_bound <= state["budget"] and not missing:
+        return {"committed_cost": lower_bound, "missing_stays": missing, "status": "within_reach"}
+
+    if missing:
+        print(f"No stay found in {', '.join(missing)} within the cap.")
+    else:
+        print(f"Committed spend ${lower_bound:,.2f} already exceeds the budget of ${state['budget']:,.2f}.")
+    # Flights are already at their cheapest option: only the stays can get cheaper (or be
+    # found at all), and only if something is left for them and the last re-query helped
+    hotel_cap = state["budget"] - committed["flights"] - committed["activities"]
+    previous = (len(state.get("missing_stays") or []), state.get("committed_cost"))
+    can_replan = hotel_cap > 0 and (previous[1] is None or (len(missing), lower_bound) < previous)
+
+    return {
+        "committed_cost": lower_bound,
+        "missing_stays": missing,
+        "total_cost": lower_bound,
+        "status": "over_budget",
+        # Over-budget gate checks count as attempts too
+        "budget_checks": state.get("budget_checks", 0) + 1,
+        "replan_target": "hotels" if can_replan else None
+    }
+
+def best_plan_agent(state: TravelState):
+    """
+    Ends an over-budget run with the best plan found across attempts: the
+    one with the fewest cities left without a stay, then the cheapest.
+    """
+    print("--- 💰 AGENT: BEST-EFFORT PLAN ---")
+    best_plan = state["best_plan"]
+    print(f"Returning the best plan found: ${best_plan['total_cost']:,.2f} (Budget: ${state['budget']:,.2f})")
+    if best_plan.get("missing_stays"):
+        print(f"⚠️ Still no stay in {', '.join(best_plan['missing_stays'])}.")
+
+    return {
+        "flight_info": best_plan["flight_info"],
+        "hotel_info": best_plan["hotel_info"],
+        "activity_info": best_plan["activity_info"],
+        "total_cost": best_plan["total_cost"],
+        "missing_stays": best_plan.get("missing_stays", []),
+        "status": "over_budget"
+    }
@@ -1,5 +1,53 @@
+import math
 from src.state import TravelState
-from src.tools.flight_tool import get_multi_city_flexible_options
+from src.tools.flight_tool import get_multi_city_flexible_options, aget_multi_city_flexible_options
+
+def _parse_price(value):
+    # The LLM sometimes formats prices ("$1,234") or leaves them out
+    if isinstance(value, str):
+        value = value.replace("$", "").replace(",", "").strip()
+    try:
+        price = float(value)
+    except (TypeError, ValueError):
+        return None
+    return price if math.isfinite(price) and price >= 0 else None
+
+def _flight_option(itinerary):
+    """
+    Normalizes one extracted itinerary; returns None when it has no usable price.
+    """
+    price = _parse_price(itinerary.get("total_price_usd")) if isinstance(itinerary, dict) else None
+    if price is None:
+        return None
+    return {
+        "total_price": price,
+        "details": itinerary.get("options_description", ""),
+        "itinerary": itinerary.get("legs", [])
+    }
+
+def _select_flight(itineraries, max_price=None):
+    # Options without a usable price are skipped rather than failing the whole node
+    options = [option for option in map(_flight_option, itineraries or []) if option is not None]
+    skipped = len(itineraries or []) - len(options)
+    if skipped:
+        print(f"⚠️ Skipped {skipped} flight option(s) without a usable price.")
+
+    # Selection logic: Pick the first option returned (the cheapest/best)
+    if not options:
+        return {"status": "error", "messages": [{"role": "system", "content": "No flights found"}]}
+    
+    best_choice = options[0]
+    if max_price is not None:
+        # Replanning: the first option that fits the cap, else the cheapest one
+        affordable = [option for option in options if option["total_price"] <= max_price]
+        best_choice = affordable[0] if affordable else min(options, key=lambda option: option["total_price"])
+    
+    # Every option is kept, so the optimizer can trade flights against stays
+    flight_info = {**best_choice, "options": options}
+    return {
+        "flight_info": flight_info,
+        "status": "flights_found"
+    }
 
 def flight_scout_agent(state: TravelState):
     print(f"--- ✈️ AGENT: FLIGHT SCOUT (Origin: {state['origin']}) ---")
@@ -11,18 +59,15 @@ def flight_scout_agent(state: TravelState):
         durations=state["durations"],
         start_window=state["start_window"]
     )
-    
-    # Selection logic: Pick the first option returned (the cheapest/best)
-    if not itineraries:
-        return {"status": "error", "messages": [{"role": "system", "content": "No flights found"}]}
-    
-    best_choice = itineraries[0]
-    
-    return {
-        "flight_info": {
-            "total_price": float(best_choice["total_price_usd"]),
-            "details": best_choice["options_description"],
-            "itinerary": best_choice["legs"]
-        },
-        "status": "flights_found"
-    }
\ No newline at end of file
+    return _select_flight(itineraries)
+
+async def aflight_scout_agent(state: TravelState):
+    print(f"--- ✈️ AGENT: FLIGHT SCOUT (Origin: {state['origin']}) ---")
+
+    itineraries = await aget_multi_city_flexible_options(
+        origin=state["origin"],
+        destinations=state["destinations"],
+        durations=state["durations"],
+        start_window=state["start_window"]
+    )
+    return _select_flight(itineraries)
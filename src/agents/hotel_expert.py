@@ -1,26 +1,79 @@
 from src.state import TravelState
-from src.tools.hotel_tool import get_hotel_info
+from src.tools.hotel_tool import get_hotels_for_trip, aget_hotels_for_trip
+from src.utils.configs import HOTEL_BUDGET_SHARE, HOTEL_CANDIDATES_PER_CITY
+
+# The planner's default stay length when a duration is missing
+DEFAULT_NIGHTS = 3
+
+# Candidate fields kept in state (the listing document is only needed for the description)
+CANDIDATE_FIELDS = ("id", "price", "url", "bedrooms", "neighbourhood", "distance")
+
+def _per_city_limit(state: TravelState) -> float:
+    # Simple budget split: give 60% (HOTEL_BUDGET_SHARE) of total budget to hotels
+    if not state["destinations"]:
+        return 0.0
+    return (state["budget"] * HOTEL_BUDGET_SHARE) / len(state["destinations"])
+
+def _nights(state: TravelState):
+    durations = state.get("durations") or []
+    return [
+        durations[i] if i < len(durations) and durations[i] else DEFAULT_NIGHTS
+        for i in range(len(state["destinations"]))
+    ]
+
+def _hotel_requests(state: TravelState, per_city_limit: float):
+    # One (city, query, max_price) tuple per destination, in trip order.
+    # Listing prices are nightly, so the city's share is spread over its nights
+    return [
+        (city, f"Best stay in {city} for {state['request']}", per_city_limit / nights)
+        for city, nights in zip(state["destinations"], _nights(state))
+    ]
+
+def _city_stays(state: TravelState, per_city_results):
+    stays = []
+    for city_result, nights in zip(per_city_results, _nights(state)):
+        # Structured candidates with the real price of the whole stay, best match first
+        candidates = [
+            {**{field: hotel.get(field) for field in CANDIDATE_FIELDS}, "total_price": hotel["price"] * nights}
+            for hotel in city_result["hotels"]
+        ]
+        stays.append({
+            "location": city_result["location"],
+            "nights": nights,
+            # No match in budget: the stay is unresolved (no price), not "free" or "at the cap"
+            "price": candidates[0]["total_price"] if candidates else None,
+            "description": city_result["description"],
+            "candidates": candidates
+        })
+    return stays
 
 def hotel_expert_agent(state: TravelState):
     print("--- 🏨 AGENT: NOMADIC HOTEL EXPERT ---")
     
-    all_hotels = []
-    # Simple budget split: give 60% of total budget to hotels
-    per_city_limit = (state["budget"] * 0.6) / len(state["destinations"])
-
-    for city in state["destinations"]:
-        print(f"Searching hotels in {city}...")
-        # Your RAG tool returns a formatted string
-        rag_output = get_hotel_info(f"Best stay in {city} for {state['request']}", per_city_limit)
-        
-        # We assume the tool provides a price; if not, we mock one for the math tool
-        all_hotels.append({
-            "location": city,
-            "price": per_city_limit, # Or extract from rag_output if possible
-            "description": rag_output
-        })
+    per_city_limit = _per_city_limit(state)
+    print(f"Searching hotels in {', '.join(state['destinations'])}...")
+
+    # All cities share one embedding request, then one filtered query per city
+    per_city_results = get_hotels_for_trip(
+        _hotel_requests(state, per_city_limit), n_results=HOTEL_CANDIDATES_PER_CITY
+    )
     
     return {
-        "hotel_info": all_hotels,
+        "hotel_info": _city_stays(state, per_city_results),
+        "status": "hotels_found"
+    }
+
+async def ahotel_expert_agent(state: TravelState):
+    print("--- 🏨 AGENT: NOMADIC HOTEL EXPERT ---")
+
+    per_city_limit = _per_city_limit(state)
+    print(f"Searching hotels in {', '.join(state['destinations'])}...")
+
+    per_city_results = await aget_hotels_for_trip(
+        _hotel_requests(state, per_city_limit), n_results=HOTEL_CANDIDATES_PER_CITY
+    )
+
+    return {
+        "hotel_info": _city_stays(state, per_city_results),
         "status": "hotels_found"
-    }
\ No newline at end of file
+    }
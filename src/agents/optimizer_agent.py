@@ -0,0 +1,54 @@
+from src.state import TravelState
+from src.utils.budget_optimizer import best_combination
+
+def _rank_values(options):
+    # Options arrive best-first (flight ranking, hotel relevance): value falls with rank
+    return [-rank for rank in range(len(options))]
+
+def optimizer_agent(state: TravelState):
+    """
+    Picks the best-value flight option and stay per city that fits the budget,
+    locally, from the candidates the searches already returned. When nothing
+    fits, it picks the cheapest combination and leaves replanning to the
+    budget check.
+    """
+    print("--- 🧮 AGENT: BUDGET OPTIMIZER ---")
+
+    flight_info = state.get("flight_info") or {}
+    flight_options = flight_info.get("options") or ([flight_info] if "total_price" in flight_info else [])
+    stays = state.get("hotel_info", [])
+    activities_cost = sum(act["total_cost"] for act in state.get("activity_info", []))
+
+    # One slot for the flights, one per city stay. A stay without candidates has
+    # nothing to choose from: it stays unresolved and the budget check rejects the plan
+    priced_stays = [stay for stay in stays if stay.get("candidates")]
+    missing = [stay["location"] for stay in stays if not stay.get("candidates")]
+    if missing:
+        print(f"⚠️ No stay to choose from in {', '.join(missing)}; optimizing the rest.")
+    slots = ([flight_options] if flight_options else []) + [stay["candidates"] for stay in priced_stays]
+    if not slots:
+        return {"status": "optimized"}
+
+    costs = [[option["total_price"] for option in options] for options in slots]
+    values = [_rank_values(options) for options in slots]
+
+    result = best_combination(costs, values, state["budget"] - activities_cost)
+    if result is not None:
+        choice, total, _ = result
+        print(f"Best-value plan within budget: ${total + activities_cost:,.2f}")
+    else:
+        choice = [min(range(len(slot_costs)), key=slot_costs.__getitem__) for slot_costs in costs]
+        print("No combination fits the budget; keeping the cheapest one.")
+
+    update = {"status": "optimized"}
+    if flight_options:
+        selected = flight_options[choice[0]]
+        update["flight_info"] = {**flight_info, **{key: selected[key] for key in ("total_price", "details", "itinerary")}}
+        choice = choice[1:]
+
+    chosen = iter(choice)
+    update["hotel_info"] = [
+        {**stay, "price": stay["candidates"][next(chosen)]["total_price"]} if stay.get("candidates") else stay
+        for stay in stays
+    ]
+    return update
@@ -1,17 +1,14 @@
 import os
 import json
-from typing import Dict
-from openai import OpenAI
+from typing import Dict, List
+from openai import OpenAI, AsyncOpenAI
 from src.state import TravelState
+from src.utils.llm_cache import llm_cache
 
 client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+async_client = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"))
 
-def planner_agent(state: TravelState) -> Dict:
-    """
-    Parses the user's request into a structured nomadic itinerary.
-    """
-    print("--- 📋 AGENT: NOMADIC PLANNER ---")
-    
+def _planner_messages(state: TravelState) -> List[Dict]:
     # We provide a detailed prompt to ensure the LLM handles multiple cities
     system_prompt = """
     You are a travel coordinator. Your goal is to parse a user's request into a structured JSON itinerary.
@@ -28,29 +25,62 @@ def planner_agent(state: TravelState) -> Dict:
 
     user_content = f"User Request: {state['request']}"
 
+    return [
+        {"role": "system", "content": system_prompt},
+        {"role": "user", "content": user_content}
+    ]
+
+def _plan_from_response(content: str) -> Dict:
+    data = json.loads(content)
+    
+    # Update the state with the new list-based fields
+    return {
+        "origin": data.get("origin", "Unknown"),
+        "destinations": data.get("destinations", []),
+        "durations": data.get("durations", []),
+        "start_window": data.get("start_window", "Flexible"),
+        "budget": float(data.get("budget", 2500.0)),
+        "status": "planning_complete"
+    }
+
+def planner_agent(state: TravelState) -> Dict:
+    """
+    Parses the user's request into a structured nomadic itinerary.
+    """
+    print("--- 📋 AGENT: NOMADIC PLANNER ---")
+
+    try:
+        content = llm_cache.complete(
+            client,
+            model="gpt-4o-mini",
+            messages=_planner_messages(state),
+            response_format={"type": "json_object"}
+        )
+        return _plan_from_response(content)
+    
+    except Exception as e:
+        print(f"Error in Planner Agent: {e}")
+        # Re-raise: a failed step isn't checkpointed, so resuming the thread
+        # re-runs the planner instead of sending an empty plan downstream
+        raise
+
+async def aplanner_agent(state: TravelState) -> Dict:
+    """
+    Async version of `planner_agent`, used when the graph runs via `app.ainvoke`.
+    """
+    print("--- 📋 AGENT: NOMADIC PLANNER ---")
+
     try:
-        response = client.chat.completions.create(
+        content = await llm_cache.acomplete(
+            async_client,
             model="gpt-4o-mini",
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_content}
-            ],
+            messages=_planner_messages(state),
             response_format={"type": "json_object"}
         )
-        
-        data = json.loads(response.choices[0].message.content)
-        
-        # 1. Update the state with the new list-based fields
-        return {
-            "origin": data.get("origin", "Unknown"),
-            "destinations": data.get("destinations", []),
-            "durations": data.get("durations", []),
-            "start_window": data.get("start_window", "Flexible"),
-            "budget": float(data.get("budget", 2500.0)),
-            "status": "planning_complete"
-        }
+        return _plan_from_response(content)
     
     except Exception as e:
         print(f"Error in Planner Agent: {e}")
-        # Fallback to prevent the graph from breaking
-        return {"status": "error", "messages": [{"role": "system", "content": str(e)}]}
\ No newline at end of file
+        # Re-raise: a failed step isn't checkpointed, so resuming the thread
+        # re-runs the planner instead of sending an empty plan downstream
+        raise
\ No newline at end of file
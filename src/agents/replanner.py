@@ -0,0 +1,63 @@
+from src.state import TravelState
+from src.agents.budget_agent import committed_costs
+from src.agents.flight_scout import _select_flight
+from src.agents.hotel_expert import _hotel_requests, _city_stays
+from src.tools.flight_tool import get_multi_city_flexible_options, aget_multi_city_flexible_options
+from src.tools.hotel_tool import get_hotels_for_trip, aget_hotels_for_trip
+from src.utils.configs import HOTEL_CANDIDATES_PER_CITY
+
+def _target_cap(state: TravelState):
+    # Whatever is left of the budget once the components we keep are paid for,
+    # at their cheapest (the optimizer will pick among their options again)
+    target = state["replan_target"]
+    costs = committed_costs(state)
+    return target, state["budget"] - (sum(costs.values()) - costs[target])
+
+def _flight_search_args(state: TravelState):
+    return {
+        "origin": state["origin"],
+        "destinations": state["destinations"],
+        "durations": state["durations"],
+        "start_window": state["start_window"]
+    }
+
+def replan_agent(state: TravelState):
+    """
+    Re-queries only the component that pushed the trip over budget, capped at
+    what's left of the budget; every other result is kept from the last attempt.
+    """
+    target, cap = _target_cap(state)
+    print(f"--- 🔁 AGENT: REPLANNER (re-querying {target}, cap ${cap:,.2f}) ---")
+
+    if target == "flights":
+        itineraries = get_multi_city_flexible_options(**_flight_search_args(state))
+        return _select_flight(itineraries, max_price=cap)
+
+    per_city_limit = cap / len(state["destinations"])
+    per_city_results = get_hotels_for_trip(
+        _hotel_requests(state, per_city_limit), n_results=HOTEL_CANDIDATES_PER_CITY
+    )
+    return {
+        "hotel_info": _city_stays(state, per_city_results),
+        "status": "hotels_found"
+    }
+
+async def areplan_agent(state: TravelState):
+    """
+    Async version of `replan_agent`.
+    """
+    target, cap = _target_cap(state)
+    print(f"--- 🔁 AGENT: REPLANNER (re-querying {target}, cap ${cap:,.2f}) ---")
+
+    if target == "flights":
+        itineraries = await aget_multi_city_flexible_options(**_flight_search_args(state))
+        return _select_flight(itineraries, max_price=cap)
+
+    per_city_limit = cap / len(state["destinations"])
+    per_city_results = await aget_hotels_for_trip(
+        _hotel_requests(state, per_city_limit), n_results=HOTEL_CANDIDATES_PER_CITY
+    )
+    return {
+        "hotel_info": _city_stays(state, per_city_results),
+        "status": "hotels_found"
+    }
@@ -0,0 +1,223 @@
+"""Runs a queue of trip requests from a JSONL file through the graph, many at a time."""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import time
+from typing import Dict, Iterator, Set, Tuple
+
+import numpy as np
+
+from src.graph import build_graph
+from src.tools.hotel_rag.hotel_index import hotel_index
+from src.utils.checkpointing import open_async_checkpointer, arun_or_resume
+from src.utils.configs import BATCH_MAX_WORKERS
+
+# Keys read for the request text, in order of preference
+REQUEST_KEYS = ("request", "body", "title")
+
+def initial_state(request: str) -> Dict:
+    return {
+        "request": request,
+        "origin": "",
+        "destinations": [],
+        "durations": [],
+        "start_window": "",
+        "budget": 0.0,
+        "messages": [],
+        "flight_info": {"total_price": 0.0, "details": "", "itinerary": []},
+        "hotel_info": [],
+        "activity_info": [],
+        "total_cost": 0.0,
+        "status": "started"
+    }
+
+def iter_requests(path: str) -> Iterator[Tuple[str, str]]:
+    """
+    Streams (request id, request text) pairs from a JSONL file, one line at a time.
+    The id comes from `request_id` / `id`, else the line number; the text from
+    `request`, falling back to `body`, then `title`. Lines without text are skipped.
+    """
+    with open(path, "r") as f:
+        for line_number, line in enumerate(f, start=1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError as e:
+                print(f"⚠️ Line {line_number}: invalid JSON ({e}), skipped.")
+                continue
+            text = next((record[key] for key in REQUEST_KEYS if record.get(key)), None)
+            if text is None:
+                print(f"⚠️ Line {line_number}: no request text, skipped.")
+                continue
+            request_id = str(record.get("request_id") or record.get("id") or line_number)
+            yield request_id, text
+
+def request_thread_id(prefix: str, request_id: str, text: str) -> str:
+    """
+    Checkpoint thread for one request: `<input file>:<request id>:<text hash>`.
+    The hash keeps an edited request from resuming (or returning) the old trip.
+    """
+    digest = hashlib.sha256(text.encode("utf-8")).hexdigest()[:12]
+    return f"{prefix}:{request_id}:{digest}"
+
+def finished_threads(output_path: str) -> Set[str]:
+    """
+    Thread ids that already have a result line in `output_path`.
+    Requests that failed are not included, so a re-run retries them.
+    """
+    if not os.path.exists(output_path):
+        return set()
+    finished = set()
+    with open(output_path, "r") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                # A crash mid-write can leave a truncated last line
+                continue
+            if "result" in record:
+                finished.add(record.get("thread_id"))
+    return finished
+
+def _ends_with_newline(path: str) -> bool:
+    with open(path, "rb") as f:
+        f.seek(-1, os.SEEK_END)
+        return f.read(1) == b"\n"
+
+def summarize_result(state: Dict) -> Dict:
+    """
+    The part of a final state worth keeping per request (drops candidate lists and messages).
+    """
+    flight_info = state.get("flight_info") or {}
+    return {
+        "status": state.get("status"),
+        "origin": state.get("origin"),
+        "destinations": state.get("destinations"),
+        "durations": state.get("durations"),
+        "budget": state.get("budget"),
+        "total_cost": state.get("total_cost"),
+        "flight": {key: flight_info.get(key) for key in ("total_price", "details", "itinerary")},
+        "hotels": [
+            {key: stay.get(key) for key in ("location", "nights", "price")}
+            for stay in state.get("hotel_info") or []
+        ],
+        "activities": [
+            {"location": group["location"], "details": group["details"]}
+            for group in state.get("activity_info") or []
+        ]
+    }
+
+async def run_batch(input_path: str, output_path: str, max_workers: int = BATCH_MAX_WORKERS) -> Dict:
+    """
+    Runs every request in `input_path` with at most `max_workers` in flight,
+    appending one JSON line per finished request to `output_path` as it completes.
+
+    Each request runs on its own checkpoint thread (see `request_thread_id`),
+    so re-running the same file resumes failed requests. Requests that already
+    have a result in `output_path` are skipped, so they aren't written twice;
+    a failed request gets a new line once its retry finishes.
+
+    Returns
+    -------
+    dict
+        Run statistics: counts, throughput and latency percentiles.
+    """
+    output_dir = os.path.dirname(output_path)
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+    thread_prefix = os.path.basename(input_path)
+    finished = finished_threads(output_path)
+
+    # Bounded queue: the file is read only as fast as workers free up
+    queue = asyncio.Queue(maxsize=max_workers * 2)
+    latencies, counts = [], {"succeeded": 0, "failed": 0, "over_budget": 0, "skipped": 0}
+    start = time.perf_counter()
+
+    async with open_async_checkpointer() as checkpointer:
+        app = build_graph(checkpointer)
+
+        with open(output_path, "a") as out:
+            if out.tell() > 0 and not _ends_with_newline(output_path):
+                # Start after a truncated last line instead of appending to it
+                out.write("\n")
+            async def worker():
+                while True:
+                    item = await queue.get()
+                    if item is None:
+                        return
+                    request_id, text, thread_id = item
+                    record = {"id": request_id, "thread_id": thread_id, "request": text}
+                    started = time.perf_counter()
+                    try:
+                        state = await arun_or_resume(app, initial_state(text), thread_id)
+                        record["result"] = summarize_result(state)
+                        counts["succeeded"] += 1
+                        if state.get("status") == "over_budget":
+                            counts["over_budget"] += 1
+                    except Exception as e:
+                        print(f"❌ Request {request_id} failed: {e}")
+                        record["error"] = f"{type(e).__name__}: {e}"
+                        counts["failed"] += 1
+                    record["latency_s"] = round(time.perf_counter() - started, 3)
+                    latencies.append(record["latency_s"])
+
+                    # One line per request, flushed right away so partial runs keep their results
+                    out.write(json.dumps(record, default=str) + "\n")
+                    out.flush()
+
+            workers = [asyncio.create_task(worker()) for _ in range(max_workers)]
+            for request_id, text in iter_requests(input_path):
+                thread_id = request_thread_id(thread_prefix, request_id, text)
+                if thread_id in finished:
+                    counts["skipped"] += 1
+                    continue
+                await queue.put((request_id, text, thread_id))
+            for _ in workers:
+                await queue.put(None)
+            await asyncio.gather(*workers)
+
+    elapsed = time.perf_counter() - start
+    total = len(latencies)
+    return {
+        "requests": total,
+        **counts,
+        "elapsed_s": elapsed,
+        "throughput_per_min": total / elapsed * 60 if elapsed > 0 else 0.0,
+        "p50_latency_s": float(np.percentile(latencies, 50)) if latencies else 0.0,
+        "p95_latency_s": float(np.percentile(latencies, 95)) if latencies else 0.0
+    }
+
+def print_report(stats: Dict, output_path: str):
+    print("\n" + "=" * 60)
+    print("📊 BATCH REPORT")
+    print("=" * 60)
+    print(f"Requests:   {stats['requests']} "
+          f"(✅ {stats['succeeded']} succeeded, ❌ {stats['failed']} failed, "
+          f"💸 {stats['over_budget']} over budget, "
+          f"⏭️ {stats['skipped']} already in results)")
+    print(f"Elapsed:    {stats['elapsed_s']:.1f}s "
+          f"({stats['throughput_per_min']:.1f} requests/min)")
+    print(f"Latency:    p50 {stats['p50_latency_s']:.2f}s | p95 {stats['p95_latency_s']:.2f}s")
+    print(f"Results:    {output_path}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run a JSONL queue of trip requests through the travel planner")
+    parser.add_argument("input", type=str, help="JSONL file, one request per line")
+    parser.add_argument("--output", type=str, default="results/batch_results.jsonl",
+                        help="JSONL file results are appended to")
+    parser.add_argument("--workers", type=int, default=BATCH_MAX_WORKERS,
+                        help="Requests in flight at the same time")
+    args = parser.parse_args()
+
+    # Open the hotel index once up front instead of in the first request
+    try:
+        print(f"🏨 Hotel index ready: {hotel_index.warm_up()} listings loaded.")
+    except Exception as e:
+        print(f"⚠️ Could not warm up hotel index: {e}")
+
+    stats = asyncio.run(run_batch(args.input, args.output, args.workers))
+    print_report(stats, args.output)
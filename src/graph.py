@@ -1,45 +1,99 @@
+from langchain_core.runnables import RunnableLambda
 from langgraph.graph import StateGraph, END
 from src.state import TravelState
 
-# Import your agents
-from src.agents.planner_agent import planner_agent
-from src.agents.flight_scout import flight_scout_agent
-from src.agents.hotel_expert import hotel_expert_agent
-from src.agents.activity_agent import activity_agent
-from src.agents.budget_agent import budget_agent
-from src.agents.accountant import route_after_budget_check
-
-# 1. Initialize the Graph with our State schema
-workflow = StateGraph(TravelState)
-
-# 2. Add Nodes (The Workers)
-workflow.add_node("planner", planner_agent)
-workflow.add_node("flights", flight_scout_agent)
-workflow.add_node("hotels", hotel_expert_agent)
-workflow.add_node("activities", activity_agent)
-workflow.add_node("budget", budget_agent)
-
-# 3. Define the Edges (The Connections)
-# We start at the planner
-workflow.set_entry_point("planner")
-
-# Standard linear flow for data gathering
-workflow.add_edge("planner", "flights")
-workflow.add_edge("flights", "hotels")
-workflow.add_edge("hotels", "activities")
-workflow.add_edge("activities", "budget")
-
-# 4. Define the Conditional Edge (The Accountant's Decision)
-workflow.add_conditional_edges(
-    "budget",                 # After the budget node finishes...
-    route_after_budget_check,  # ...consult the Accountant logic
-    {
-        "success": END,               # If okay, exit the graph
-        "recalculate": "planner"      # If over budget, go back to the start
-    }
-)
-
-# 5. Compile the Graph
-app = workflow.compile()
+# Import your agents (each has a sync and an async version)
+from src.agents.planner_agent import planner_agent, aplanner_agent
+from src.agents.flight_scout import flight_scout_agent, aflight_scout_agent
+from src.agents.hotel_expert import hotel_expert_agent, ahotel_expert_agent
+from src.agents.activity_agent import activity_agent, aactivity_agent
+from src.agents.optimizer_agent import optimizer_agent
+from src.agents.budget_agent import budget_agent, best_plan_agent, cost_gate_agent
+from src.agents.replanner import replan_agent, areplan_agent
+from src.agents.accountant import route_after_budget_check, route_after_cost_gate, route_after_replan
+from src.utils.configs import EARLY_BUDGET_PRUNING, REPLAN_MODE
+
+def build_graph(checkpointer=None):
+    """
+    Builds and compiles the travel-planning graph.
+    With a `checkpointer`, every completed step is saved under the run's
+    thread id, so a failed or interrupted run can be resumed and past runs
+    inspected (see src/utils/checkpointing.py).
+    """
+    # 1. Initialize the Graph with our State schema
+    workflow = StateGraph(TravelState)
+
+    # 2. Add Nodes (The Workers)
+    # app.invoke uses the sync agents, app.ainvoke / app.astream the async ones
+    workflow.add_node("planner", RunnableLambda(planner_agent, afunc=aplanner_agent))
+    workflow.add_node("flights", RunnableLambda(flight_scout_agent, afunc=aflight_scout_agent))
+    workflow.add_node("hotels", RunnableLambda(hotel_expert_agent, afunc=ahotel_expert_agent))
+    workflow.add_node("activities", RunnableLambda(activity_agent, afunc=aactivity_agent))
+    workflow.add_node("optimizer", optimizer_agent)
+    workflow.add_node("budget", budget_agent)
+    workflow.add_node("replan", RunnableLambda(replan_agent, afunc=areplan_agent))
+    workflow.add_node("best_effort", best_plan_agent)
+
+    # 3. Define the Edges (The Connections)
+    # We start at the planner
+    workflow.set_entry_point("planner")
+
+    if EARLY_BUDGET_PRUNING:
+        # Opt-in: flights and hotels carry almost all of the cost, so search them
+        # in parallel first, then check the committed spend before paying for
+        # activity searches (activities no longer overlap with the other two)
+        workflow.add_node("cost_gate", cost_gate_agent)
+        workflow.add_edge("planner", "flights")
+        workflow.add_edge("planner", "hotels")
+        workflow.add_edge(["flights", "hotels"], "cost_gate")
+        workflow.add_conditional_edges(
+            "cost_gate",
+            route_after_cost_gate,
+            {
+                "continue": "activities",     # Budget still reachable
+                "replan": "replan",           # Re-query stays with what's left
+                "fail": END                   # Doomed: stop before searching activities
+            }
+        )
+        workflow.add_edge("activities", "optimizer")
+    else:
+        # Default fan-out: the three searches don't depend on each other, so they run in parallel
+        workflow.add_edge("planner", "flights")
+        workflow.add_edge("planner", "hotels")
+        workflow.add_edge("planner", "activities")
+
+        # Fan-in: the optimizer waits for all three branches to finish
+        workflow.add_edge(["flights", "hotels", "activities"], "optimizer")
+
+    # The optimizer picks the best-value combination of the candidates, then hands over to the budget check
+    workflow.add_edge("optimizer", "budget")
+
+    # 4. Define the Conditional Edge (The Accountant's Decision)
+    workflow.add_conditional_edges(
+        "budget",                 # After the budget node finishes...
+        route_after_budget_check,  # ...consult the Accountant logic
+        {
+            "success": END,               # If okay, exit the graph
+            # If over budget, re-query just the offending component (or, in
+            # "full" mode, go back to the start)
+            "recalculate": "replan" if REPLAN_MODE == "incremental" else "planner",
+            "give_up": "best_effort"      # Out of attempts: return the cheapest plan found
+        }
+    )
+
+    # A replan only touches one component; its new candidates go back through the
+    # optimizer (or, when it came from the cost gate, back to the gate)
+    workflow.add_conditional_edges(
+        "replan",
+        route_after_replan,
+        {"optimize": "optimizer", "gate": "cost_gate" if EARLY_BUDGET_PRUNING else "optimizer"}
+    )
+    workflow.add_edge("best_effort", END)
+
+    # 5. Compile the Graph
+    return workflow.compile(checkpointer=checkpointer)
+
+# Stateless instance for callers that don't need checkpoints
+app = build_graph()
 
 print("✅ Graph structure defined and compiled successfully.")
\ No newline at end of file
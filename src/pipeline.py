@@ -0,0 +1,219 @@
+"""Runs the listings data pipeline (clean -> summarize -> index) for many cities at once."""
+
+import argparse
+import glob
+import os
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+
+from src.utils.accomodation_cleaner import process_listings
+from src.utils.configs import SUMMARY_MAX_WORKERS
+from src.utils.review_summarizer import attach_summaries, stream_recent_reviews
+from src.utils.table_io import read_table, write_table
+
+LISTINGS_SUFFIX = "_listings_raw.csv"
+
+@dataclass
+class CityJob:
+    """
+    Input and output paths of one city's run.
+    Raw dumps follow the `<city>_listings_raw.csv` / `<city>_reviews.csv` naming.
+    """
+    city: str
+    listings_raw: str
+    reviews_raw: str
+    output_dir: str
+    # Format of the files handed between stages: "parquet", "arrow" or "csv"
+    table_format: str = "parquet"
+
+    @property
+    def name(self) -> str:
+        # "new_york" -> "New York", the form the planner produces
+        return self.city.replace("_", " ").title()
+
+    @property
+    def listings_cleaned(self) -> str:
+        return os.path.join(self.output_dir, f"listings_cleaned.{self.table_format}")
+
+    @property
+    def listings_with_reviews(self) -> str:
+        return os.path.join(self.output_dir, f"listings_with_reviews.{self.table_format}")
+
+    @property
+    def summary_store(self) -> str:
+        return os.path.join(self.output_dir, "review_summaries.jsonl")
+
+@dataclass
+class CityStatus:
+    stage: str = "queued"
+    error: str = ""
+    timings: dict = field(default_factory=dict)
+
+def find_city_jobs(patterns, reviews_dir, output_root, table_format="parquet"):
+    """
+    Expands listing-dump paths or globs into one job per city.
+    """
+    jobs = []
+    for pattern in patterns:
+        for path in sorted(glob.glob(pattern)) or [pattern]:
+            file_name = os.path.basename(path)
+            if not file_name.endswith(LISTINGS_SUFFIX):
+                raise ValueError(f"Expected a '<city>{LISTINGS_SUFFIX}' file, got: {path}")
+            city = file_name[: -len(LISTINGS_SUFFIX)]
+            jobs.append(CityJob(
+                city=city,
+                listings_raw=path,
+                reviews_raw=os.path.join(reviews_dir, f"{city}_reviews.csv"),
+                output_dir=os.path.join(output_root, city),
+                table_format=table_format
+            ))
+    return jobs
+
+def prepare_city(job, chunksize):
+    """
+    CPU-bound stage, run in a worker process: cleans the listings and selects
+    each listing's most recent reviews.
+    """
+    start = time.perf_counter()
+    process_listings(job.listings_raw, job.listings_cleaned, chunksize=chunksize)
+    cleaned = time.perf_counter()
+    grouped_reviews = stream_recent_reviews(job.reviews_raw)
+    return grouped_reviews, {"clean": cleaned - start, "select_reviews": time.perf_counter() - cleaned}
+
+def enrich_city(job, grouped_reviews, status, summary_workers, full_index, export_csv):
+    """
+    API-bound stage, run on a thread in the main process so every city shares
+    the same OpenAI rate limiter: summarizes reviews, then indexes the listings.
+    """
+    # Imported here so worker processes never load Chroma
+    from src.tools.hotel_rag.build_index import build_hotel_index
+
+    status.stage = "summarizing"
+    start = time.perf_counter()
+    attach_summaries(
+        grouped_reviews,
+        job.listings_cleaned,
+        job.listings_with_reviews,
+        store_path=job.summary_store,
+        max_workers=summary_workers
+    )
+    summarized = time.perf_counter()
+    status.timings["summarize"] = summarized - start
+
+    status.stage = "indexing"
+    build_hotel_index(city=job.name, input_path=job.listings_with_reviews, incremental=not full_index)
+    status.timings["index"] = time.perf_counter() - summarized
+
+    if export_csv and job.table_format != "csv":
+        csv_path = os.path.join(job.output_dir, "listings_with_reviews.csv")
+        write_table(read_table(job.listings_with_reviews), csv_path)
+    status.stage = "done"
+
+def print_status(jobs, statuses):
+    print("\n" + "=" * 60)
+    print("🏙️ PIPELINE STATUS")
+    print("=" * 60)
+    for job in jobs:
+        status = statuses[job.city]
+        timings = ", ".join(f"{stage} {seconds:.1f}s" for stage, seconds in status.timings.items())
+        line = f"{job.name:<20} {status.stage:<12} {timings}"
+        if status.error:
+            line += f"\n    ❌ {status.error}"
+        print(line)
+
+def run_pipeline(jobs, cpu_workers=None, api_workers=2, summary_workers=SUMMARY_MAX_WORKERS,
+                 chunksize=None, full_index=False, export_csv=False):
+    """
+    Runs clean -> summarize -> index for every city.
+
+    Cleaning and review selection run on a process pool. As soon as a city
+    finishes them, its summarize and index stages start on a thread pool in
+    this process, where all cities share the OpenAI rate limiter. A failing
+    city is reported without stopping the others.
+
+    Returns
+    -------
+    dict
+        City -> CityStatus.
+    """
+    statuses = {job.city: CityStatus() for job in jobs}
+    with ProcessPoolExecutor(max_workers=cpu_workers) as cpu_pool, \
+            ThreadPoolExecutor(max_workers=api_workers) as api_pool:
+        prepared = {}
+        for job in jobs:
+            statuses[job.city].stage = "cleaning"
+            prepared[cpu_pool.submit(prepare_city, job, chunksize)] = job
+
+        enriching = {}
+        for future in as_completed(prepared):
+            job = prepared[future]
+            status = statuses[job.city]
+            try:
+                grouped_reviews, timings = future.result()
+            except Exception as e:
+                status.stage, status.error = "failed", f"prepare: {e}"
+                continue
+            status.timings.update(timings)
+            status.stage = "queued_api"
+            print(f"🧹 {job.name}: cleaned and reviews selected.")
+            enriching[api_pool.submit(
+                enrich_city, job, grouped_reviews, status, summary_workers, full_index, export_csv
+            )] = job
+
+        for future in as_completed(enriching):
+            job = enriching[future]
+            status = statuses[job.city]
+            try:
+                future.result()
+                print(f"✅ {job.name}: indexed.")
+            except Exception as e:
+                status.error = f"{status.stage}: {e}"
+                status.stage = "failed"
+                traceback.print_exc()
+
+    print_status(jobs, statuses)
+    return statuses
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Clean, summarize and index InsideAirbnb dumps for several cities"
+    )
+    parser.add_argument(
+        "listings",
+        nargs="+",
+        help="Raw listing dumps or globs, e.g. 'data/raw/listings/*_listings_raw.csv'"
+    )
+    parser.add_argument("--reviews-dir", type=str, default="data/raw/reviews",
+                        help="Directory holding the <city>_reviews.csv files")
+    parser.add_argument("--output-root", type=str, default="data/processed",
+                        help="Per-city outputs go to <output-root>/<city>/")
+    parser.add_argument("--cpu-workers", type=int, default=None,
+                        help="Processes for cleaning and review selection (default: CPU count)")
+    parser.add_argument("--api-workers", type=int, default=2,
+                        help="Cities summarized and indexed at the same time")
+    parser.add_argument("--summary-workers", type=int, default=SUMMARY_MAX_WORKERS,
+                        help="Concurrent summary requests per city")
+    parser.add_argument("--chunksize", type=int, default=None,
+                        help="Clean listings in chunks of this many rows")
+    parser.add_argument("--full-index", action="store_true",
+                        help="Re-embed every listing instead of only the diff")
+    parser.add_argument("--format", choices=["parquet", "arrow", "csv"], default="parquet",
+                        help="File format handed between stages")
+    parser.add_argument("--export-csv", action="store_true",
+                        help="Also write listings_with_reviews.csv for each city")
+    args = parser.parse_args()
+
+    jobs = find_city_jobs(args.listings, args.reviews_dir, args.output_root, args.format)
+    statuses = run_pipeline(
+        jobs,
+        cpu_workers=args.cpu_workers,
+        api_workers=args.api_workers,
+        summary_workers=args.summary_workers,
+        chunksize=args.chunksize,
+        full_index=args.full_index,
+        export_csv=args.export_csv
+    )
+    if any(status.stage == "failed" for status in statuses.values()):
+        raise SystemExit(1)
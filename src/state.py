@@ -1,23 +1,35 @@
 import operator
-from typing import Annotated, List, Dict, Union, TypedDict
+from typing import Annotated, List, Dict, Optional, Union, TypedDict
 
 # 1. FlightInfo now supports the 'legs' from your nomadic tool
 class FlightInfo(TypedDict):
     price: float
     details: str
     itinerary: List[Dict]
+    # Every option the search returned (total_price, details, itinerary)
+    options: List[Dict]
 
 # 2. HotelInfo now supports the formatted string output from your RAG tool
 class HotelInfo(TypedDict):
     location: str
-    price: float
+    nights: int
+    # None when the search found no stay within the cap
+    price: Optional[float]
     description: str
+    # Structured matches, best first; `total_price` is the nightly price x nights
+    candidates: List[Dict]
 
 class ActivityInfo(TypedDict):
     location: str
     total_cost: float
     details: List[Dict]
 
+def latest_status(current: str, update: str) -> str:
+    """
+    Reducer for fields written by parallel branches: the last update wins.
+    """
+    return update
+
 # 3. The Final TravelState
 class TravelState(TypedDict):
     request: str
@@ -34,4 +46,15 @@ class TravelState(TypedDict):
     activity_info: List[ActivityInfo]
     
     total_cost: float
-    status: str
\ No newline at end of file
+    # flights, hotels and activities run in parallel and all report a status
+    status: Annotated[str, latest_status]
+
+    # Replanning: number of budget checks so far, the component to re-query
+    # next (None when replanning can't help) and the cheapest plan seen
+    budget_checks: int
+    replan_target: Optional[str]
+    best_plan: Dict
+    # Cheapest reachable total at the cost gate (flights + hotels + activity estimate)
+    committed_cost: float
+    # Cities whose hotel search came back empty; a plan with any is not within budget
+    missing_stays: List[str]
\ No newline at end of file
@@ -1,38 +1,29 @@
 import os
 import json
 from typing import List, Dict
-from tavily import TavilyClient
-from openai import OpenAI
+from tavily import TavilyClient, AsyncTavilyClient
+from openai import OpenAI, AsyncOpenAI
 from dotenv import load_dotenv
+from src.utils.llm_cache import llm_cache
+from src.utils.search_cache import activity_search_cache
 
 load_dotenv()
 
 tavily = TavilyClient(api_key=os.getenv("TAVILY_API_KEY"))
 openai_client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
 
-def search_activities(location: str, user_input: str) -> List[Dict]:
-    """
-    Finds activities based on natural language input (phrases, sentences, or keywords).
-    """
-    
-    # 1. Generate an optimized search query based on the user's natural language
+# Async twins of the clients above, used by the awaitable graph (app.ainvoke / app.astream)
+async_tavily = AsyncTavilyClient(api_key=os.getenv("TAVILY_API_KEY"))
+async_openai_client = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+
+def _query_gen_messages(location: str, user_input: str) -> List[Dict]:
     # This turns "cheap eats and cool views" -> "best affordable restaurants with scenic views in [Location]"
     query_gen_prompt = f"Transform this user request into a highly effective search engine query for finding local activities in {location}. Request: {user_input}"
-    
-    query_refinement = openai_client.chat.completions.create(
-        model="gpt-4o-mini",
-        messages=[{"role": "user", "content": query_gen_prompt}],
-        temperature=0
-    )
-    optimized_query = query_refinement.choices[0].message.content
-    
-    print(f"🔍 Optimized Query: {optimized_query}")
+    return [{"role": "user", "content": query_gen_prompt}]
 
-    # 2. Search Tavily with the refined query
-    search_result = tavily.search(query=optimized_query, search_depth="advanced", max_results=6)
+def _extract_messages(user_input: str, search_result: Dict) -> List[Dict]:
     context = "\n".join([res['content'] for res in search_result['results']])
 
-    # 3. Use LLM to structure the 'clean list'
     extract_prompt = f"""
     You are a local tour guide. Based on the context provided, find 5 activities that best match the user's interest: "{user_input}".
     
@@ -45,15 +36,66 @@ def search_activities(location: str, user_input: str) -> List[Dict]:
 
     Context: {context}
     """
+    return [{"role": "system", "content": extract_prompt}]
+
+def search_activities(location: str, user_input: str) -> List[Dict]:
+    """
+    Finds activities based on natural language input (phrases, sentences, or keywords).
+    """
+    
+    # 1. Generate an optimized search query based on the user's natural language
+    optimized_query = llm_cache.complete(
+        openai_client,
+        model="gpt-4o-mini",
+        messages=_query_gen_messages(location, user_input),
+        temperature=0
+    )
+    
+    print(f"🔍 Optimized Query: {optimized_query}")
+
+    # 2. Search Tavily with the refined query (cached; identical concurrent searches share one request)
+    search_result = activity_search_cache.search(tavily, query=optimized_query, search_depth="advanced", max_results=6)
+
+    # 3. Use LLM to structure the 'clean list'
+    try:
+        content = llm_cache.complete(
+            openai_client,
+            model="gpt-4o-mini",
+            messages=_extract_messages(user_input, search_result),
+            response_format={ "type": "json_object" },
+            temperature=0
+        )
+        data = json.loads(content)
+        return data.get("activities", [])
+    
+    except Exception as e:
+        print(f"Error parsing activities: {e}")
+        return []
+
+async def asearch_activities(location: str, user_input: str) -> List[Dict]:
+    """
+    Async version of `search_activities`. Same prompts, non-blocking clients.
+    """
+    optimized_query = await llm_cache.acomplete(
+        async_openai_client,
+        model="gpt-4o-mini",
+        messages=_query_gen_messages(location, user_input),
+        temperature=0
+    )
+    
+    print(f"🔍 Optimized Query: {optimized_query}")
+
+    search_result = await activity_search_cache.asearch(async_tavily, query=optimized_query, search_depth="advanced", max_results=6)
 
     try:
-        response = openai_client.chat.completions.create(
+        content = await llm_cache.acomplete(
+            async_openai_client,
             model="gpt-4o-mini",
-            messages=[{"role": "system", "content": extract_prompt}],
+            messages=_extract_messages(user_input, search_result),
             response_format={ "type": "json_object" },
             temperature=0
         )
-        data = json.loads(response.choices[0].message.content)
+        data = json.loads(content)
         return data.get("activities", [])
     
     except Exception as e:
@@ -72,4 +114,4 @@ if __name__ == "__main__":
     for i, act in enumerate(results):
         print(f"{i+1}. {act['name']} ({act['cost']})")
         print(f"   Vibe: {act['vibe']}")
-        print(f"   Note: {act['description']}\n")
\ No newline at end of file
+        print(f"   Note: {act['description']}\n")
@@ -1,26 +1,28 @@
 import os
 import json
 from typing import List, Dict, Optional, Union
-from tavily import TavilyClient
-from openai import OpenAI
+from tavily import TavilyClient, AsyncTavilyClient
+from openai import OpenAI, AsyncOpenAI
 from dotenv import load_dotenv
+from src.utils.llm_cache import llm_cache
+from src.utils.search_cache import flight_search_cache
 
 load_dotenv()
 tavily = TavilyClient(api_key=os.getenv("TAVILY_API_KEY"))
 openai_client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
 
-def get_multi_city_flexible_options(
+# Async twins of the clients above, used by the awaitable graph (app.ainvoke / app.astream)
+async_tavily = AsyncTavilyClient(api_key=os.getenv("TAVILY_API_KEY"))
+async_openai_client = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+
+def _build_search_query(
     origin: str,
-    destinations: List[str],      # e.g., ["Tokyo", "Osaka"]
-    durations: List[int],         # e.g., [4, 2] (4 nights in Tokyo, 2 in Osaka)
-    start_window: str,            # e.g., "Early June 2026"
-    seat_class: str = "economy"
-) -> List[Dict]:
-    """
-    Finds complete multi-city itineraries with flexible dates based on stay durations.
-    """
-    
-    # 1. Build a prompt that describes the 'flow' of the trip
+    destinations: List[str],
+    durations: List[int],
+    start_window: str,
+    seat_class: str
+) -> str:
+    # Build a prompt that describes the 'flow' of the trip
     itinerary_desc = f"Start at {origin}, then "
     for city, stay in zip(destinations, durations):
         itinerary_desc += f"spend approximately {stay} nights in {city}, then "
@@ -32,13 +34,12 @@ def get_multi_city_flexible_options(
         f"Search for 'multi-city fare calendars' and 'flexible round trip multi-stop'. "
         f"Identify the cheapest sequence of dates that respects the stay durations."
     )
+    return query
 
-    print(f"✈️ Searching for nomadic itinerary: {destinations}...")
-    
-    search_result = tavily.search(query=query, search_depth="advanced", max_results=5)
+def _extract_messages(search_result: Dict) -> List[Dict]:
     context = "\n".join([res['content'] for res in search_result['results']])
 
-    # 2. Extract a 'Full Journey' JSON
+    # Extract a 'Full Journey' JSON
     extract_prompt = f"""
     You are a world-class travel agent. Find the 3 best 'Full Itinerary' options.
     Each option must include ALL legs of the trip.
@@ -55,15 +56,65 @@ def get_multi_city_flexible_options(
 
     Context: {context}
     """
+    return [{"role": "system", "content": extract_prompt}]
+
+def get_multi_city_flexible_options(
+    origin: str,
+    destinations: List[str],      # e.g., ["Tokyo", "Osaka"]
+    durations: List[int],         # e.g., [4, 2] (4 nights in Tokyo, 2 in Osaka)
+    start_window: str,            # e.g., "Early June 2026"
+    seat_class: str = "economy"
+) -> List[Dict]:
+    """
+    Finds complete multi-city itineraries with flexible dates based on stay durations.
+    """
+    query = _build_search_query(origin, destinations, durations, start_window, seat_class)
+
+    print(f"✈️ Searching for nomadic itinerary: {destinations}...")
+    
+    # Fares change quickly, so this cache only holds results for a short window
+    search_result = flight_search_cache.search(tavily, query=query, search_depth="advanced", max_results=5)
+
+    try:
+        content = llm_cache.complete(
+            openai_client,
+            model="gpt-4o-mini",
+            messages=_extract_messages(search_result),
+            response_format={ "type": "json_object" },
+            temperature=0
+        )
+        data = json.loads(content)
+        return data.get("itineraries", [])
+    
+    except Exception as e:
+        print(f"Error parsing nomadic itinerary: {e}")
+        return []
+
+async def aget_multi_city_flexible_options(
+    origin: str,
+    destinations: List[str],
+    durations: List[int],
+    start_window: str,
+    seat_class: str = "economy"
+) -> List[Dict]:
+    """
+    Async version of `get_multi_city_flexible_options`. Same prompts, non-blocking clients.
+    """
+    query = _build_search_query(origin, destinations, durations, start_window, seat_class)
+
+    print(f"✈️ Searching for nomadic itinerary: {destinations}...")
+    
+    search_result = await flight_search_cache.asearch(async_tavily, query=query, search_depth="advanced", max_results=5)
 
     try:
-        response = openai_client.chat.completions.create(
+        content = await llm_cache.acomplete(
+            async_openai_client,
             model="gpt-4o-mini",
-            messages=[{"role": "system", "content": extract_prompt}],
+            messages=_extract_messages(search_result),
             response_format={ "type": "json_object" },
             temperature=0
         )
-        data = json.loads(response.choices[0].message.content)
+        data = json.loads(content)
         return data.get("itineraries", [])
     
     except Exception as e:
@@ -1,24 +1,166 @@
+import argparse
+import hashlib
+import json
 import pandas as pd
-import chromadb
 from chromadb.utils import embedding_functions
 import os
 from dotenv import load_dotenv
 from tqdm import tqdm # Useful for progress bars
+from src.tools.hotel_rag.embedding_pipeline import EmbeddingPipeline
+from src.tools.hotel_rag.hotel_index import get_chroma_client
+from src.utils.configs import EMBEDDING_MODEL
+from src.utils.embedding_cache import embedding_cache
+from src.utils.table_io import iter_table_batches
 
 load_dotenv()
 
 # 1. Setup OpenAI Embedding Function
 openai_ef = embedding_functions.OpenAIEmbeddingFunction(
     api_key=os.getenv("OPENAI_API_KEY"),
-    model_name="text-embedding-3-small" # Efficient and cheap
+    model_name=EMBEDDING_MODEL # Efficient and cheap
 )
 
-def build_hotel_index():
-    # Load your gold data
-    df = pd.read_csv("data/processed/listings_with_reviews.csv")
-    
+BATCH_SIZE = 500
+
+# The only columns the index needs; Parquet/Arrow inputs skip the rest on read
+INDEX_COLUMNS = [
+    'id', 'name', 'neighbourhood_cleansed', 'description', 'amenities',
+    'review_summary', 'price', 'listing_url', 'bedrooms'
+]
+
+def content_hash(document, metadata):
+    """
+    Fingerprints a listing's document text and metadata.
+    A listing only needs re-embedding when this value changes.
+    """
+    payload = json.dumps({"document": document, "metadata": metadata}, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+def build_documents(chunk, city):
+    """
+    Builds the Chroma document, metadata and id for every listing in a chunk.
+    Strings and metadata columns are assembled with vectorized column
+    operations; only the per-row hashing runs in Python.
+
+    Returns
+    -------
+    tuple of (list of str, list of dict, list of str)
+        Documents, metadatas (including a `content_hash`) and ids.
+    """
+    # THE DOCUMENT: This is what the AI 'reads' to find a match.
+    # We combine the name, description, and review summary.
+    def text(column):
+        # Missing values read as "nan", like formatting the row value in an f-string
+        return chunk[column].astype("string").fillna("nan")
+
+    documents = (
+        "Name: " + text('name')
+        + ". Location: " + text('neighbourhood_cleansed')
+        + ". Description: " + text('description')
+        + ". Amenities: " + text('amenities')
+        + ". Guest Vibe: " + text('review_summary')
+    ).tolist()
+    ids = chunk['id'].astype(str).tolist()
+
+    # THE METADATA: This is used for hard filtering (Price, Bedrooms).
+    metadatas = pd.DataFrame({
+        "price": chunk['price'].astype(float),
+        "url": chunk['listing_url'],
+        "id": ids,
+        "bedrooms": chunk['bedrooms'].astype(int),
+        "neighbourhood": chunk['neighbourhood_cleansed'],
+        # Lets one collection hold several cities and be filtered per city
+        "city": city
+    }).to_dict("records")
+
+    for document, metadata in zip(documents, metadatas):
+        metadata["content_hash"] = content_hash(document, metadata)
+
+    return documents, metadatas, ids
+
+def iter_listing_batches(input_path, city, batch_size=BATCH_SIZE):
+    """
+    Streams the listings file in chunks of `batch_size` rows and yields the
+    prepared (documents, metadatas, ids) of each chunk, so memory use depends
+    on the batch size rather than the size of the city.
+    """
+    for chunk in iter_table_batches(input_path, batch_size, columns=INDEX_COLUMNS):
+        yield build_documents(chunk, city)
+
+def existing_hashes(collection, city, page_size=5000):
+    """
+    Reads the `content_hash` of every listing of `city` already in the collection.
+
+    Returns
+    -------
+    dict
+        Listing id -> stored content hash (None for listings indexed before hashing).
+    """
+    hashes = {}
+    offset = 0
+    while True:
+        page = collection.get(
+            where={"city": city},
+            include=["metadatas"],
+            limit=page_size,
+            offset=offset
+        )
+        for listing_id, meta in zip(page["ids"], page["metadatas"]):
+            hashes[listing_id] = (meta or {}).get("content_hash")
+        if len(page["ids"]) < page_size:
+            return hashes
+        offset += page_size
+
+def source_fingerprint(input_path, city, incremental):
+    # Identifies the input a checkpoint belongs to; a new dump starts from scratch
+    stat = os.stat(input_path)
+    return f"{os.path.abspath(input_path)}:{stat.st_size}:{stat.st_mtime_ns}:{city}:{incremental}"
+
+def load_checkpoint(path, fingerprint):
+    """
+    Returns how many batches of the input `fingerprint` were already written,
+    or 0 when there is no checkpoint for that exact input.
+    """
+    if not os.path.exists(path):
+        return 0
+    with open(path, "r") as f:
+        checkpoint = json.load(f)
+    if checkpoint.get("fingerprint") != fingerprint:
+        return 0
+    return checkpoint.get("completed_batches", 0)
+
+def save_checkpoint(path, fingerprint, completed_batches):
+    # Write-then-rename so a crash never leaves a half-written checkpoint
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump({"fingerprint": fingerprint, "completed_batches": completed_batches}, f)
+    os.replace(tmp_path, path)
+
+def build_hotel_index(
+    city: str = "Tokyo",
+    input_path: str = "data/processed/listings_with_reviews.parquet",
+    incremental: bool = True,
+    batch_size: int = BATCH_SIZE
+):
+    """
+    Embeds listings into the Chroma collection.
+
+    The listings file is streamed in batches of `batch_size` rows, so peak
+    memory depends on the batch size rather than the size of the city.
+
+    In incremental mode (the default), only listings whose document or metadata
+    changed since the last build are re-embedded and upserted, and listings
+    that disappeared from the dump are deleted. With `incremental=False` every
+    listing is re-embedded.
+
+    Either way, progress is checkpointed after each batch, so an interrupted
+    build resumes from the last completed batch when re-run on the same file.
+
+    Embeddings are computed up front by an `EmbeddingPipeline` with several
+    requests in flight and handed to Chroma via `embeddings=`.
+    """
     # Initialize Chroma Persistent Client
-    client = chromadb.PersistentClient(path="chroma_db")
+    client = get_chroma_client("chroma_db")
     
     # Create (or get) the collection
     collection = client.get_or_create_collection(
@@ -26,41 +168,79 @@ def build_hotel_index():
         embedding_function=openai_ef
     )
 
-    print("🛠️ Preparing documents and metadata...")
-    documents = []
-    metadatas = []
-    ids = []
-
-    for _, row in tqdm(df.iterrows(), total=len(df)):
-        # THE DOCUMENT: This is what the AI 'reads' to find a match.
-        # We combine the name, description, and review summary.
-        doc_text = f"Name: {row['name']}. Location: {row['neighbourhood_cleansed']}. " \
-                   f"Description: {row['description']}. Amenities: {row['amenities']}. " \
-                   f"Guest Vibe: {row['review_summary']}"
-        
-        documents.append(doc_text)
-        
-        # THE METADATA: This is used for hard filtering (Price, Bedrooms).
-        metadatas.append({
-            "price": float(row['price']),
-            "url": row['listing_url'],
-            "id": str(row['id']),
-            "bedrooms": int(row['bedrooms']),
-            "neighbourhood": row['neighbourhood_cleansed']
-        })
-        
-        ids.append(str(row['id']))
-
-    # 3. Add to ChromaDB in batches (Chroma handles large data better in chunks)
-    batch_size = 500
-    for i in range(0, len(documents), batch_size):
-        collection.add(
-            documents=documents[i:i+batch_size],
-            metadatas=metadatas[i:i+batch_size],
-            ids=ids[i:i+batch_size]
-        )
+    # Only ids and hashes of what's already indexed are held for the whole run
+    stored = existing_hashes(collection, city)
+    seen_ids = set()
+
+    checkpoint_path = os.path.join("chroma_db", f"build_checkpoint_{city.lower()}.json")
+    fingerprint = source_fingerprint(input_path, city, incremental)
+    start_batch = load_checkpoint(checkpoint_path, fingerprint)
+    if start_batch:
+        print(f"⏩ Resuming after batch {start_batch}.")
+
+    counts = {"written": 0, "unchanged": 0}
 
-    print(f"✅ Successfully indexed {len(documents)} listings into ChromaDB!")
+    def pending_batches():
+        for batch_number, (documents, metadatas, ids) in enumerate(
+            iter_listing_batches(input_path, city, batch_size)
+        ):
+            seen_ids.update(ids)
+            if batch_number < start_batch:
+                continue
+
+            # Work out which listings of this batch actually need writing
+            if incremental:
+                pending = [
+                    i for i, (listing_id, meta) in enumerate(zip(ids, metadatas))
+                    if stored.get(listing_id) != meta["content_hash"]
+                ]
+            else:
+                pending = list(range(len(ids)))
+            counts["unchanged"] += len(ids) - len(pending)
+
+            yield [documents[i] for i in pending], (
+                batch_number,
+                [metadatas[i] for i in pending],
+                [ids[i] for i in pending]
+            )
+
+    # Several batches are embedded at once while earlier ones are written to Chroma
+    pipeline = EmbeddingPipeline()
+    print("🛠️ Streaming documents and metadata...")
+    for documents, (batch_number, metadatas, ids), vectors in tqdm(pipeline.imap(pending_batches())):
+        if documents:
+            collection.upsert(
+                documents=documents,
+                embeddings=vectors,
+                metadatas=metadatas,
+                ids=ids
+            )
+            counts["written"] += len(documents)
+        save_checkpoint(checkpoint_path, fingerprint, batch_number + 1)
+
+    # Drop listings that are no longer in the dump
+    removed = [listing_id for listing_id in stored if listing_id not in seen_ids]
+    for i in range(0, len(removed), batch_size):
+        collection.delete(ids=removed[i:i + batch_size])
+
+    if os.path.exists(checkpoint_path):
+        os.remove(checkpoint_path)
+
+    print(f"✅ Successfully indexed {counts['written']} listings into ChromaDB "
+          f"({counts['unchanged']} unchanged, {len(removed)} removed, {collection.count()} total)!")
+    print(f"⚡ Embedding throughput: {pipeline.report()}")
+    print(f"📊 Embedding cache: {embedding_cache.stats()}")
 
 if __name__ == "__main__":
-    build_hotel_index()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Build or refresh the hotel listings index")
+    parser.add_argument("--city", type=str, default="Tokyo", help="City the listings belong to")
+    parser.add_argument(
+        "--input",
+        type=str,
+        default="data/processed/listings_with_reviews.parquet",
+        help="Path to the listings-with-reviews file"
+    )
+    parser.add_argument("--full", action="store_true", help="Re-embed every listing instead of only the diff")
+    args = parser.parse_args()
+
+    build_hotel_index(city=args.city, input_path=args.input, incremental=not args.full)
@@ -0,0 +1,147 @@
+"""Concurrent, rate-limit-aware embedding stage for index builds."""
+
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Iterable, Iterator, List, Tuple
+
+from openai import RateLimitError
+
+from src.utils.configs import (
+    EMBEDDING_MAX_IN_FLIGHT,
+    EMBEDDING_MAX_RETRIES,
+    EMBEDDING_MAX_TOKENS_PER_REQUEST,
+)
+from src.utils.embedding_cache import embedding_cache
+from src.utils.rate_limiter import openai_rate_limiter
+
+try:
+    import tiktoken
+    _encoding = tiktoken.get_encoding("cl100k_base")
+except Exception:
+    # Not installed, or the encoding file can't be downloaded (e.g. offline)
+    _encoding = None
+
+def count_tokens(text: str) -> int:
+    """
+    Token count of `text`: exact with tiktoken installed, otherwise the usual
+    ~4 characters per token estimate.
+    """
+    if _encoding is not None:
+        return len(_encoding.encode(text))
+    return len(text) // 4 + 1
+
+def token_batches(texts: List[str], max_tokens: int, max_items: int = 2048) -> List[Tuple[int, int]]:
+    """
+    Splits `texts` into consecutive (start, end) slices that each stay under
+    `max_tokens` tokens and `max_items` inputs, the limits of one embeddings request.
+    """
+    slices = []
+    start = 0
+    tokens = 0
+    for i, text in enumerate(texts):
+        text_tokens = count_tokens(text)
+        if i > start and (tokens + text_tokens > max_tokens or i - start >= max_items):
+            slices.append((start, i))
+            start = i
+            tokens = 0
+        tokens += text_tokens
+    if start < len(texts):
+        slices.append((start, len(texts)))
+    return slices
+
+class EmbeddingPipeline:
+    """
+    Embeds batches of documents with several requests in flight.
+
+    Each batch is split into token-bounded requests that go through the shared
+    embedding cache. A 429 is retried with exponential backoff and jitter.
+    Batches come back in submission order, so callers can checkpoint as they go.
+
+    Parameters
+    ----------
+    max_in_flight : int
+        Number of batches embedded concurrently.
+    max_tokens_per_request : int
+        Token budget of a single embeddings request.
+    max_retries : int
+        Attempts per request before a rate-limit error is raised.
+    """
+
+    def __init__(
+        self,
+        max_in_flight: int = EMBEDDING_MAX_IN_FLIGHT,
+        max_tokens_per_request: int = EMBEDDING_MAX_TOKENS_PER_REQUEST,
+        max_retries: int = EMBEDDING_MAX_RETRIES
+    ):
+        self.max_in_flight = max(1, max_in_flight)
+        self.max_tokens_per_request = max_tokens_per_request
+        self.max_retries = max_retries
+
+        self.texts = 0
+        self.tokens = 0
+        self.requests = 0
+        self.retries = 0
+        self._started = None
+        self._lock = threading.Lock()
+
+    def _embed_request(self, texts: List[str]) -> List:
+        for attempt in range(self.max_retries):
+            openai_rate_limiter.acquire()
+            try:
+                return embedding_cache.embed(texts)
+            except RateLimitError:
+                if attempt == self.max_retries - 1:
+                    raise
+                with self._lock:
+                    self.retries += 1
+                delay = min(60.0, 2 ** attempt) + random.uniform(0, 1)
+                print(f"⏳ Embedding rate limit hit, retrying in {delay:.1f}s...")
+                time.sleep(delay)
+
+    def embed(self, texts: List[str]) -> List:
+        """
+        Embeds one batch of documents, one token-bounded request at a time.
+        """
+        vectors = []
+        for start, end in token_batches(texts, self.max_tokens_per_request):
+            vectors.extend(self._embed_request(texts[start:end]))
+            with self._lock:
+                self.requests += 1
+                self.texts += end - start
+                self.tokens += sum(count_tokens(text) for text in texts[start:end])
+        return vectors
+
+    def imap(self, batches: Iterable[Tuple[List[str], Any]]) -> Iterator[Tuple[List[str], Any, List]]:
+        """
+        Embeds a stream of (documents, payload) batches concurrently.
+
+        Yields (documents, payload, vectors) in the order the batches were
+        given, keeping at most `max_in_flight` batches embedding at once.
+        """
+        self._started = time.perf_counter()
+        pending = deque()
+        with ThreadPoolExecutor(max_workers=self.max_in_flight) as executor:
+            for documents, payload in batches:
+                pending.append((documents, payload, executor.submit(self.embed, documents)))
+                if len(pending) >= self.max_in_flight:
+                    documents, payload, future = pending.popleft()
+                    yield documents, payload, future.result()
+            while pending:
+                documents, payload, future = pending.popleft()
+                yield documents, payload, future.result()
+
+    def report(self) -> str:
+        """
+        Human-readable throughput summary of everything embedded so far.
+        """
+        elapsed = time.perf_counter() - self._started if self._started else 0.0
+        rate = self.texts / elapsed if elapsed else 0.0
+        token_rate = self.tokens / elapsed if elapsed else 0.0
+        return (
+            f"{self.texts} texts / {self.tokens} tokens in {self.requests} requests "
+            f"over {elapsed:.1f}s ({rate:.1f} texts/s, {token_rate:,.0f} tokens/s, "
+            f"{self.retries} rate-limit retries)"
+        )
@@ -0,0 +1,171 @@
+import os
+import threading
+from typing import Dict, List, Tuple
+import chromadb
+from chromadb.utils import embedding_functions
+from dotenv import load_dotenv
+from src.utils.configs import EMBEDDING_MODEL, HOTEL_INDEX_BACKEND
+from src.utils.embedding_cache import embedding_cache
+
+load_dotenv()
+
+CHROMA_PATH = "chroma_db"
+COLLECTION_NAME = "tokyo_listings"
+
+_clients = {}
+_clients_lock = threading.Lock()
+
+def get_chroma_client(path: str = CHROMA_PATH):
+    """
+    Returns the process-wide Chroma client for `path`.
+    Chroma's client setup isn't safe to run from several threads at once, so
+    it happens once per path, under a lock.
+    """
+    with _clients_lock:
+        if path not in _clients:
+            _clients[path] = chromadb.PersistentClient(path=path)
+        return _clients[path]
+
+class HotelIndex:
+    """
+    Long-lived handle on the hotel listings collection.
+
+    The Chroma client and collection are opened once per process, on first use
+    (or eagerly via `warm_up`), and then shared by every request and thread.
+    """
+
+    def __init__(self, path: str = CHROMA_PATH, collection_name: str = COLLECTION_NAME):
+        self.path = path
+        self.collection_name = collection_name
+        self._collection = None
+        self._has_city = None
+        self._lock = threading.Lock()
+
+    @property
+    def collection(self):
+        # Double-checked locking: only the first caller pays for opening SQLite/HNSW
+        if self._collection is None:
+            with self._lock:
+                if self._collection is None:
+                    embedding_function = embedding_functions.OpenAIEmbeddingFunction(
+                        api_key=os.getenv("OPENAI_API_KEY"),
+                        model_name=EMBEDDING_MODEL
+                    )
+                    client = get_chroma_client(self.path)
+                    self._collection = client.get_collection(
+                        name=self.collection_name,
+                        embedding_function=embedding_function
+                    )
+        return self._collection
+
+    def warm_up(self) -> int:
+        """
+        Opens the collection ahead of the first request. Call this at startup.
+
+        Returns
+        -------
+        int
+            Number of listings in the collection.
+        """
+        return self.collection.count()
+
+    def query(self, query_text: str, max_price: float, n_results: int = 3) -> dict:
+        """
+        Finds the listings closest to `query_text` with a nightly price of at most `max_price`.
+
+        Returns
+        -------
+        dict
+            Raw Chroma query result for the single query text.
+        """
+        # Embed through the shared cache so repeated query texts skip the API call
+        return self.collection.query(
+            query_embeddings=embedding_cache.embed([query_text]),
+            n_results=n_results,
+            where={"price": {"$lte": max_price}} # The 'Accountant' logic is built-in!
+        )
+
+    @property
+    def has_city_metadata(self) -> bool:
+        # Indexes built before listings carried a 'city' field can't be filtered by city
+        if self._has_city is None:
+            sample = self.collection.peek(limit=1)
+            metadatas = sample.get("metadatas") or [{}]
+            self._has_city = "city" in (metadatas[0] or {})
+        return self._has_city
+
+    def query_batch(self, requests: List[Tuple[str, str, float]], n_results: int = 3) -> List[Dict]:
+        """
+        Runs the hotel search for every city of a trip at once.
+
+        All query texts are embedded in one request. Each city is then
+        searched with its own `where` clause (its city and its price cap), so a
+        city with many close listings can't crowd the others out.
+
+        Parameters
+        ----------
+        requests : list of (city, query_text, max_price)
+            One entry per city, in trip order.
+        n_results : int
+            Listings to return per city.
+
+        Returns
+        -------
+        list of dict
+            One entry per request, in the same order, with the city, the query
+            and a list of matching hotels (id, price, url, bedrooms,
+            neighbourhood, document, distance).
+        """
+        if not requests:
+            return []
+        embeddings = embedding_cache.embed([query for _, query, _ in requests])
+        return self.search_batch(embeddings, requests, n_results)
+
+    def search_batch(self, embeddings, requests: List[Tuple[str, str, float]], n_results: int = 3) -> List[Dict]:
+        """
+        Same as `query_batch`, with the query embeddings already computed
+        (one per request).
+        """
+        per_city = []
+        for embedding, (city, query, max_price) in zip(embeddings, requests):
+            where = {"price": {"$lte": max_price}}
+            if self.has_city_metadata:
+                where = {"$and": [where, {"city": city}]}
+            results = self.collection.query(
+                query_embeddings=[embedding],
+                n_results=n_results,
+                where=where
+            )
+
+            hotels = [
+                {
+                    "id": meta["id"],
+                    "price": float(meta["price"]),
+                    "url": meta["url"],
+                    "bedrooms": meta.get("bedrooms"),
+                    "neighbourhood": meta.get("neighbourhood"),
+                    "document": doc,
+                    "distance": distance
+                }
+                for meta, doc, distance in zip(
+                    results["metadatas"][0], results["documents"][0], results["distances"][0]
+                )
+            ]
+            per_city.append({"location": city, "query": query, "max_price": max_price, "hotels": hotels})
+        return per_city
+
+def make_hotel_index():
+    """
+    Builds the hotel search backend selected by HOTEL_INDEX_BACKEND.
+    Both backends expose the same query / query_batch / warm_up methods.
+    """
+    if HOTEL_INDEX_BACKEND == "hybrid":
+        from src.tools.hotel_rag.hybrid_index import HybridHotelIndex
+        return HybridHotelIndex()
+    if HOTEL_INDEX_BACKEND == "numpy":
+        from src.tools.hotel_rag.numpy_index import NumpyHotelIndex
+        return NumpyHotelIndex()
+    return HotelIndex()
+
+# Shared process-wide instance
+hotel_index = make_hotel_index()
@@ -0,0 +1,219 @@
+"""Hybrid lexical + vector hotel retrieval over the embedded NumPy index.
+
+Queries such as "Modern studio with fast wifi near Shibuya" hinge on exact
+amenity and neighbourhood terms that a pure embedding search can rank below
+vaguely similar listings. `HybridHotelIndex` narrows the candidates with
+precomputed metadata indexes before any scoring:
+
+- a sorted price array (a price cap becomes one binary search),
+- bedroom buckets (a "2 bedroom" or "studio" query keeps matching rows),
+- neighbourhood inverted lists (a query naming a neighbourhood keeps its rows),
+
+and then ranks what's left by a weighted fusion of the vector similarity and a
+BM25 score over the listing documents built by `build_index.py`.
+"""
+
+import re
+from collections import Counter
+from typing import List, Tuple
+
+import numpy as np
+
+from src.tools.hotel_rag.numpy_index import NumpyHotelIndex
+from src.utils.configs import HYBRID_VECTOR_WEIGHT, NUMPY_INDEX_PATH
+
+# BM25 parameters (the usual defaults)
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# Words every hotel query shares; they carry no ranking signal
+STOPWORDS = {
+    "a", "an", "and", "the", "in", "on", "at", "to", "for", "of", "with", "near",
+    "best", "stay", "trip", "day", "days", "i", "we", "my", "our", "want", "is", "are",
+}
+
+# Generic suffixes in neighbourhood names ("Shibuya Ku", "Shinjuku-ku")
+NEIGHBOURHOOD_SUFFIXES = {"ku", "shi", "city", "ward", "district"}
+
+BEDROOMS_PATTERN = re.compile(r"\b(\d+)\s*[- ]?\s*(?:bed|beds|bedroom|bedrooms|br)\b")
+
+def tokenize(text: str) -> List[str]:
+    return [token for token in re.findall(r"[a-z0-9]+", str(text).lower()) if token not in STOPWORDS]
+
+def _neighbourhood_key(name: str) -> str:
+    tokens = [token for token in re.findall(r"[a-z0-9]+", str(name).lower()) if token not in NEIGHBOURHOOD_SUFFIXES]
+    return " ".join(tokens)
+
+def parse_min_bedrooms(query_text: str):
+    """
+    Reads a bedroom requirement out of the query ("2 bedroom", "3-bed").
+    A "studio" is read as 0, which keeps listings with at most one bedroom.
+    Returns None when the query doesn't say.
+    """
+    text = str(query_text).lower()
+    match = BEDROOMS_PATTERN.search(text)
+    if match:
+        return int(match.group(1))
+    if re.search(r"\bstudio\b", text):
+        return 0
+    return None
+
+class HybridHotelIndex(NumpyHotelIndex):
+    """
+    NumPy hotel index with metadata pre-filters and BM25 + vector rank fusion.
+
+    Parameters
+    ----------
+    path : str
+        Directory written by `NumpyHotelIndex.write` / `export_from_chroma`.
+    vector_weight : float
+        Weight of the (min-max normalized) vector similarity in the fused
+        score; BM25 gets the remainder.
+    """
+
+    def __init__(self, path: str = NUMPY_INDEX_PATH, vector_weight: float = HYBRID_VECTOR_WEIGHT):
+        super().__init__(path)
+        self.vector_weight = vector_weight
+        self._indexed = False
+
+    def _load(self):
+        super()._load()
+        if self._indexed:
+            return
+        with self._lock:
+            if self._indexed:
+                return
+            self._build_prefilters()
+            self._build_bm25()
+            self._indexed = True
+
+    def _build_prefilters(self):
+        # Sorted price array: rows with price <= cap are a prefix of `price_order`
+        self.price_order = np.argsort(self.price, kind="stable").astype(np.int32)
+        self.price_sorted = self.price[self.price_order]
+
+        # Bedroom buckets and neighbourhood / city inverted lists (sorted row ids)
+        self.bedroom_buckets = {
+            int(count): np.flatnonzero(self.bedrooms == count).astype(np.int32)
+            for count in np.unique(self.bedrooms) if count >= 0
+        }
+        self.neighbourhood_rows = {
+            code: np.flatnonzero(self.neighbourhood == code).astype(np.int32)
+            for code in range(len(self.neighbourhoods))
+        }
+        self.city_rows = {
+            code: np.flatnonzero(self.city == code).astype(np.int32)
+            for code in range(len(self.cities))
+        }
+        self.neighbourhood_keys = {
+            _neighbourhood_key(name): code for code, name in enumerate(self.neighbourhoods)
+            if _neighbourhood_key(name)
+        }
+
+    def _build_bm25(self):
+        # Postings store the finished BM25 term weight per (term, row), so a
+        # query only has to sum weights over its terms
+        documents = self.listings.column("document").to_pylist()
+        counts = [Counter(tokenize(document)) for document in documents]
+        lengths = np.array([sum(c.values()) for c in counts], dtype=np.float32)
+        norm = BM25_K1 * (1 - BM25_B + BM25_B * lengths / max(lengths.mean(), 1.0))
+
+        postings_rows, postings_tf = {}, {}
+        for row, c in enumerate(counts):
+            for term, tf in c.items():
+                postings_rows.setdefault(term, []).append(row)
+                postings_tf.setdefault(term, []).append(tf)
+
+        n_docs = len(documents)
+        self.postings = {}
+        for term, rows in postings_rows.items():
+            rows = np.array(rows, dtype=np.int32)
+            tf = np.array(postings_tf[term], dtype=np.float32)
+            idf = np.log(1 + (n_docs - rows.size + 0.5) / (rows.size + 0.5))
+            self.postings[term] = (rows, idf * tf * (BM25_K1 + 1) / (tf + norm[rows]))
+
+    def _candidates(self, city_code, max_price: float, query_text: str, n_results: int) -> np.ndarray:
+        """
+        Sorted row ids that pass the hard filters (price, city) and, when the
+        query asks for them, the bedroom and neighbourhood filters. A soft
+        filter that would leave fewer than `n_results` rows is dropped.
+        """
+        in_budget = self.price_order[:np.searchsorted(self.price_sorted, max_price, side="right")]
+        mask = np.zeros(self.price.size, dtype=bool)
+        mask[in_budget] = True
+        if city_code is not None:
+            city_mask = np.zeros_like(mask)
+            city_mask[self.city_rows.get(city_code, np.empty(0, dtype=np.int32))] = True
+            mask &= city_mask
+
+        soft_filters = []
+        min_bedrooms = parse_min_bedrooms(query_text)
+        if min_bedrooms is not None:
+            if min_bedrooms == 0:
+                buckets = [rows for count, rows in self.bedroom_buckets.items() if count <= 1]
+            else:
+                buckets = [rows for count, rows in self.bedroom_buckets.items() if count >= min_bedrooms]
+            soft_filters.append(buckets)
+        normalized_query = " " + " ".join(re.findall(r"[a-z0-9]+", str(query_text).lower())) + " "
+        named = [code for key, code in self.neighbourhood_keys.items() if f" {key} " in normalized_query]
+        if named:
+            soft_filters.append([self.neighbourhood_rows[code] for code in named])
+
+        for lists in soft_filters:
+            allowed = np.zeros_like(mask)
+            for rows in lists:
+                allowed[rows] = True
+            if np.count_nonzero(mask & allowed) >= n_results:
+                mask &= allowed
+        return np.flatnonzero(mask)
+
+    def bm25(self, query_text: str, rows: np.ndarray) -> np.ndarray:
+        """
+        BM25 score of every row in `rows` (sorted row ids) for `query_text`.
+        """
+        scores = np.zeros(rows.size, dtype=np.float32)
+        for term in set(tokenize(query_text)):
+            if term not in self.postings:
+                continue
+            term_rows, weights = self.postings[term]
+            positions = np.searchsorted(rows, term_rows)
+            hit = positions < rows.size
+            hit[hit] = rows[positions[hit]] == term_rows[hit]
+            scores[positions[hit]] += weights[hit]
+        return scores
+
+    def _search(self, embeddings, requests: List[Tuple[str, str, float]], n_results: int):
+        self._load()
+        queries = np.asarray(embeddings, dtype=np.float32).reshape(len(requests), -1)
+        per_request = [
+            self._candidates(self._city_code(city), max_price, query_text, n_results)
+            for city, query_text, max_price in requests
+        ]
+        union = np.unique(np.concatenate(per_request)) if per_request else np.empty(0, dtype=np.int64)
+        if union.size == 0:
+            return [[] for _ in requests]
+
+        # One blocked matrix product over the union of the (already narrowed) candidates
+        distances = self._distances(union, queries)
+
+        results = []
+        for j, ((_, query_text, _), rows) in enumerate(zip(requests, per_request)):
+            if rows.size == 0:
+                results.append([])
+                continue
+            query_distances = distances[np.searchsorted(union, rows), j]
+            fused = (
+                self.vector_weight * _min_max(-query_distances)
+                + (1 - self.vector_weight) * _min_max(self.bm25(query_text, rows))
+            )
+            k = min(n_results, rows.size)
+            top = np.argpartition(-fused, k - 1)[:k]
+            top = top[np.argsort(-fused[top])]
+            results.append([(int(rows[i]), float(query_distances[i])) for i in top])
+        return results
+
+def _min_max(values: np.ndarray) -> np.ndarray:
+    spread = values.max() - values.min()
+    if spread <= 0:
+        return np.zeros_like(values)
+    return (values - values.min()) / spread
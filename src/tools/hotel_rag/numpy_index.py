@@ -0,0 +1,291 @@
+"""Embedded hotel search backend: a memory-mapped embedding matrix plus columnar metadata.
+
+For single-city collections of a few tens of thousands of listings, an exact
+masked dot-product search over a memory-mapped matrix is faster and lighter
+than running Chroma (SQLite + HNSW). `NumpyHotelIndex` exposes the same
+methods as `HotelIndex`, so the hotel tool works with either backend.
+
+On-disk layout (one directory per collection)::
+
+    embeddings.npy   float16/float32 matrix, one row per listing (memory-mapped)
+    norms.npy        squared L2 norm of each row
+    price.npy        float32 nightly price
+    bedrooms.npy     int16 bedroom count (-1 when unknown)
+    city.npy         int32 code into meta.json["cities"] (-1 when unknown)
+    neighbourhood.npy  int32 code into meta.json["neighbourhoods"]
+    listings.arrow   id, url, neighbourhood, document (memory-mapped Arrow IPC)
+    meta.json        category tables, dtype and row count
+"""
+
+import argparse
+import json
+import os
+import threading
+from typing import Dict, List, Tuple
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.ipc as ipc
+
+from src.utils.configs import NUMPY_INDEX_PATH
+from src.utils.embedding_cache import embedding_cache
+
+# Candidate rows scored per block, so a query never materializes the whole matrix in float32
+SCORE_BLOCK_ROWS = 4096
+
+def _codes(values, categories):
+    lookup = {value: code for code, value in enumerate(categories)}
+    return np.array([lookup.get(value, -1) for value in values], dtype=np.int32)
+
+class NumpyHotelIndex:
+    """
+    Exact vector search over a memory-mapped embedding matrix.
+
+    Filters (price cap, city) are evaluated as boolean masks over columnar
+    metadata arrays; only the surviving rows are scored, with blocked dot
+    products. Distances are squared L2, the same as Chroma's default space.
+
+    Parameters
+    ----------
+    path : str
+        Directory written by `NumpyHotelIndex.write` / `export_from_chroma`.
+    """
+
+    def __init__(self, path: str = NUMPY_INDEX_PATH):
+        self.path = path
+        self._loaded = False
+        self._lock = threading.Lock()
+
+    def _load(self):
+        if self._loaded:
+            return
+        with self._lock:
+            if self._loaded:
+                return
+            with open(os.path.join(self.path, "meta.json"), "r") as f:
+                meta = json.load(f)
+            self.cities = meta["cities"]
+            self.neighbourhoods = meta["neighbourhoods"]
+            self._city_lookup = {city: code for code, city in enumerate(self.cities)}
+
+            self.embeddings = np.load(os.path.join(self.path, "embeddings.npy"), mmap_mode="r")
+            self.norms = np.load(os.path.join(self.path, "norms.npy"))
+            self.price = np.load(os.path.join(self.path, "price.npy"))
+            self.bedrooms = np.load(os.path.join(self.path, "bedrooms.npy"))
+            self.city = np.load(os.path.join(self.path, "city.npy"))
+            self.neighbourhood = np.load(os.path.join(self.path, "neighbourhood.npy"))
+            self.listings = ipc.open_file(
+                pa.memory_map(os.path.join(self.path, "listings.arrow"), "r")
+            ).read_all()
+            self._loaded = True
+
+    def warm_up(self) -> int:
+        """
+        Maps the index files ahead of the first request. Returns the number of listings.
+        """
+        self._load()
+        return len(self.price)
+
+    def count(self) -> int:
+        return self.warm_up()
+
+    @property
+    def has_city_metadata(self) -> bool:
+        self._load()
+        return bool(self.cities)
+
+    def _city_code(self, city):
+        # None (or a collection without cities) means "any city"
+        if city is None or not self.cities:
+            return None
+        return self._city_lookup.get(city, -1)
+
+    def _distances(self, rows, queries):
+        """
+        Squared L2 distances between `rows` of the matrix and each query vector,
+        scored in blocks.
+        """
+        scores = np.empty((rows.size, len(queries)), dtype=np.float32)
+        for start in range(0, rows.size, SCORE_BLOCK_ROWS):
+            block = rows[start:start + SCORE_BLOCK_ROWS]
+            scores[start:start + block.size] = self.embeddings[block].astype(np.float32) @ queries.T
+        return self.norms[rows, None] - 2 * scores + (queries * queries).sum(axis=1)[None, :]
+
+    def _search(self, embeddings, requests: List[Tuple[str, str, float]], n_results: int):
+        """
+        Core search: one (city or None, query_text, max_price) request per query vector.
+
+        Returns
+        -------
+        list of list of (row, distance)
+            Best rows per query, closest first.
+        """
+        self._load()
+        queries = np.asarray(embeddings, dtype=np.float32).reshape(len(requests), -1)
+        filters = [(self._city_code(city), max_price) for city, _, max_price in requests]
+
+        # One pass over the metadata for the union of all filters...
+        mask = self.price <= max(max_price for _, max_price in filters)
+        city_codes = {code for code, _ in filters}
+        if None not in city_codes:
+            mask &= np.isin(self.city, list(city_codes))
+        candidates = np.flatnonzero(mask)
+        if candidates.size == 0:
+            return [[] for _ in filters]
+
+        # ...and one blocked matrix product for all queries at once
+        distances = self._distances(candidates, queries)
+
+        results = []
+        for j, (city_code, max_price) in enumerate(filters):
+            valid = self.price[candidates] <= max_price
+            if city_code is not None:
+                valid &= self.city[candidates] == city_code
+            rows = np.flatnonzero(valid)
+            if rows.size == 0:
+                results.append([])
+                continue
+            k = min(n_results, rows.size)
+            query_distances = distances[rows, j]
+            top = np.argpartition(query_distances, k - 1)[:k]
+            top = top[np.argsort(query_distances[top])]
+            results.append([(int(candidates[rows[i]]), float(query_distances[i])) for i in top])
+        return results
+
+    def _hotel(self, row: int, distance: float) -> Dict:
+        record = self.listings.slice(row, 1).to_pylist()[0]
+        bedrooms = int(self.bedrooms[row])
+        return {
+            "id": record["id"],
+            "price": float(self.price[row]),
+            "url": record["url"],
+            "bedrooms": bedrooms if bedrooms >= 0 else None,
+            "neighbourhood": record["neighbourhood"],
+            "document": record["document"],
+            "distance": distance
+        }
+
+    def query(self, query_text: str, max_price: float, n_results: int = 3) -> dict:
+        """
+        Finds the listings closest to `query_text` with a nightly price of at most `max_price`.
+
+        Returns
+        -------
+        dict
+            Chroma-style result (ids, documents, metadatas, distances) for the single query.
+        """
+        embeddings = embedding_cache.embed([query_text])
+        hits = self._search(embeddings, [(None, query_text, max_price)], n_results)[0]
+        hotels = [self._hotel(row, distance) for row, distance in hits]
+        return {
+            "ids": [[hotel["id"] for hotel in hotels]],
+            "documents": [[hotel["document"] for hotel in hotels]],
+            "metadatas": [[
+                {key: hotel[key] for key in ("id", "price", "url", "bedrooms", "neighbourhood")}
+                for hotel in hotels
+            ]],
+            "distances": [[hotel["distance"] for hotel in hotels]]
+        }
+
+    def query_batch(self, requests: List[Tuple[str, str, float]], n_results: int = 3) -> List[Dict]:
+        """
+        Same contract as `HotelIndex.query_batch`: one embedding request and
+        one pass over the matrix for all cities of a trip.
+        """
+        if not requests:
+            return []
+        embeddings = embedding_cache.embed([query for _, query, _ in requests])
+        return self.search_batch(embeddings, requests, n_results)
+
+    def search_batch(self, embeddings, requests: List[Tuple[str, str, float]], n_results: int = 3) -> List[Dict]:
+        """
+        Same as `query_batch`, with the query embeddings already computed.
+        """
+        hits = self._search(embeddings, requests, n_results)
+        return [
+            {
+                "location": city,
+                "query": query,
+                "max_price": max_price,
+                "hotels": [self._hotel(row, distance) for row, distance in city_hits]
+            }
+            for (city, query, max_price), city_hits in zip(requests, hits)
+        ]
+
+    @staticmethod
+    def write(path: str, ids, embeddings, metadatas, documents, dtype: str = "float16"):
+        """
+        Writes an index directory from listings in Chroma's shape
+        (ids, embeddings, metadata dicts, documents).
+        """
+        os.makedirs(path, exist_ok=True)
+        matrix = np.asarray(embeddings, dtype=np.float32)
+        stored = matrix.astype(dtype)
+        # Norms of the stored (possibly float16) rows, so distances stay consistent
+        norms = (stored.astype(np.float32) ** 2).sum(axis=1)
+
+        cities = sorted({m.get("city") for m in metadatas if m.get("city")})
+        neighbourhoods = sorted({m.get("neighbourhood") for m in metadatas if m.get("neighbourhood")})
+
+        np.save(os.path.join(path, "embeddings.npy"), stored)
+        np.save(os.path.join(path, "norms.npy"), norms.astype(np.float32))
+        np.save(os.path.join(path, "price.npy"), np.array([m["price"] for m in metadatas], dtype=np.float32))
+        np.save(os.path.join(path, "bedrooms.npy"), np.array(
+            [m.get("bedrooms") if m.get("bedrooms") is not None else -1 for m in metadatas], dtype=np.int16
+        ))
+        np.save(os.path.join(path, "city.npy"), _codes([m.get("city") for m in metadatas], cities))
+        np.save(os.path.join(path, "neighbourhood.npy"), _codes(
+            [m.get("neighbourhood") for m in metadatas], neighbourhoods
+        ))
+
+        table = pa.table({
+            "id": [str(m.get("id", listing_id)) for listing_id, m in zip(ids, metadatas)],
+            "url": [m.get("url") for m in metadatas],
+            "neighbourhood": [m.get("neighbourhood") for m in metadatas],
+            "document": list(documents)
+        })
+        with pa.OSFile(os.path.join(path, "listings.arrow"), "wb") as sink:
+            with ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+
+        with open(os.path.join(path, "meta.json"), "w") as f:
+            json.dump({
+                "count": len(ids),
+                "dtype": dtype,
+                "cities": cities,
+                "neighbourhoods": neighbourhoods
+            }, f)
+
+def export_from_chroma(collection, path: str = NUMPY_INDEX_PATH, dtype: str = "float16", page_size: int = 5000):
+    """
+    Copies a Chroma collection (vectors, metadata, documents) into a NumPy index directory.
+    """
+    ids, embeddings, metadatas, documents = [], [], [], []
+    offset = 0
+    while True:
+        page = collection.get(
+            include=["embeddings", "metadatas", "documents"],
+            limit=page_size,
+            offset=offset
+        )
+        ids.extend(page["ids"])
+        embeddings.extend(page["embeddings"])
+        metadatas.extend(page["metadatas"])
+        documents.extend(page["documents"])
+        if len(page["ids"]) < page_size:
+            break
+        offset += page_size
+
+    NumpyHotelIndex.write(path, ids, embeddings, metadatas, documents, dtype=dtype)
+    print(f"✅ Exported {len(ids)} listings to {path} ({dtype}).")
+
+if __name__ == "__main__":
+    from src.tools.hotel_rag.hotel_index import HotelIndex
+
+    parser = argparse.ArgumentParser(description="Export the Chroma hotel collection to a NumPy index")
+    parser.add_argument("--output", type=str, default=NUMPY_INDEX_PATH, help="Index directory to write")
+    parser.add_argument("--dtype", choices=["float16", "float32"], default="float16",
+                        help="Storage precision of the embedding matrix")
+    args = parser.parse_args()
+
+    export_from_chroma(HotelIndex().collection, args.output, args.dtype)
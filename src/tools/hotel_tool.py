@@ -1,42 +1,70 @@
-import chromadb
-from chromadb.utils import embedding_functions
-import os
-from dotenv import load_dotenv
+import asyncio
+from typing import Dict, List, Tuple
+from src.tools.hotel_rag.hotel_index import hotel_index
 
-load_dotenv()
+def format_hotels(hotels: List[Dict]) -> str:
+    """
+    Formats structured hotel matches into the text block handed to the LLM.
+    """
+    if not hotels:
+        return "No stays found matching that criteria and budget."
+
+    # Format the output for the LLM
+    output = "Here are the top matches within your budget:\n\n"
+    for hotel in hotels:
+        output += f"🏨 {hotel['id']}: ${hotel['price']}/night\n"
+        output += f"Summary: {hotel['document'][:200]}...\n"
+        output += f"Link: {hotel['url']}\n\n"
 
-openai_ef = embedding_functions.OpenAIEmbeddingFunction(
-    api_key=os.getenv("OPENAI_API_KEY"),
-    model_name="text-embedding-3-small"
-)
+    return output
 
 def get_hotel_info(location_query: str, max_price: float):
     """
     Search ChromaDB for hotels matching a description and budget.
     """
-    client = chromadb.PersistentClient(path="chroma_db")
-    collection = client.get_collection(name="tokyo_listings", embedding_function=openai_ef)
+    # The collection is opened once per process and reused across calls
+    results = hotel_index.query(location_query, max_price, n_results=3)
 
-    # Query the database
-    results = collection.query(
-        query_texts=[location_query],
-        n_results=3,
-        where={"price": {"$lte": max_price}} # The 'Accountant' logic is built-in!
-    )
+    hotels = [
+        {"id": meta['id'], "price": meta['price'], "url": meta['url'], "document": doc}
+        for meta, doc in zip(results['metadatas'][0], results['documents'][0])
+    ]
+    return format_hotels(hotels)
 
-    if not results['documents'][0]:
-        return "No stays found matching that criteria and budget."
+def get_hotels_for_trip(requests: List[Tuple[str, str, float]], n_results: int = 3) -> List[Dict]:
+    """
+    Batched hotel search for a whole trip: one embedding request, one filtered
+    query per city.
 
-    # Format the output for the LLM
-    output = "Here are the top matches within your budget:\n\n"
-    for i in range(len(results['documents'][0])):
-        meta = results['metadatas'][0][i]
-        doc = results['documents'][0][i]
-        output += f"🏨 {meta['id']}: ${meta['price']}/night\n"
-        output += f"Summary: {doc[:200]}...\n"
-        output += f"Link: {meta['url']}\n\n"
+    Parameters
+    ----------
+    requests : list of (city, query_text, max_price)
+        One entry per city, in trip order.
 
-    return output
+    Returns
+    -------
+    list of dict
+        Per-city results in trip order, each with the structured `hotels`
+        matches and their formatted `description`.
+    """
+    per_city = hotel_index.query_batch(requests, n_results=n_results)
+    for city_result in per_city:
+        city_result["description"] = format_hotels(city_result["hotels"])
+    return per_city
+
+async def aget_hotel_info(location_query: str, max_price: float):
+    """
+    Async version of `get_hotel_info`.
+    Chroma only ships a blocking client, so the search runs on a worker thread
+    instead of stalling the event loop.
+    """
+    return await asyncio.to_thread(get_hotel_info, location_query, max_price)
+
+async def aget_hotels_for_trip(requests: List[Tuple[str, str, float]], n_results: int = 3) -> List[Dict]:
+    """
+    Async version of `get_hotels_for_trip`, run on a worker thread.
+    """
+    return await asyncio.to_thread(get_hotels_for_trip, requests, n_results)
 
 # --- TEST IT ---
 if __name__ == "__main__":
@@ -2,12 +2,12 @@
 
 import argparse
 import numpy as np
-import os
 import pandas as pd
 import re
 
 from argparse import Namespace
 from pathlib import Path
+from src.utils.table_io import TableWriter, write_table
 
 # --- HELPER FUNCTIONS ---
 def validate_columns(df, required_cols):
@@ -59,6 +59,28 @@ def parse_bathrooms(text):
         return float(match.group(1))
     return np.nan
 
+def parse_bathrooms_column(texts):
+    """
+    Vectorized version of `parse_bathrooms` for a whole column.
+
+    Parameters
+    ----------
+    texts : pandas.Series
+        Bathroom descriptions (e.g., "1.5 baths", "Half-bath"), possibly missing.
+
+    Returns
+    -------
+    pandas.Series
+        Parsed number of bathrooms as floats, NaN if unavailable or unparseable.
+    """
+    lower = texts.str.lower()
+    counts = lower.str.extract(r'(\d+(?:\.\d+)?)', expand=False).astype(float)
+    half_bath_only = (
+        lower.str.contains('half-bath', regex=False, na=False)
+        & ~lower.str.contains(r'\d', regex=True, na=False)
+    )
+    return counts.mask(half_bath_only, 0.5)
+
 def process_bathroom_counts(df):
     """
     Cleans and standardizes bathroom-related fields.
@@ -75,11 +97,13 @@ def process_bathroom_counts(df):
     -------
     pandas.DataFrame
         DataFrame with cleaned bathroom counts and a `bathroom_shared` flag.
+        The input frame is modified in place.
     """
     # Fill bathroom counts
-    df = df.copy()
+    # Cast to the column's dtype: pandas refuses values it would have to round
     mask = df['bathrooms'].isna()
-    df.loc[mask, 'bathrooms'] = df.loc[mask, 'bathrooms_text'].apply(parse_bathrooms)
+    parsed = parse_bathrooms_column(df.loc[mask, 'bathrooms_text'])
+    df.loc[mask, 'bathrooms'] = parsed.astype(df['bathrooms'].dtype)
 
     # Define the shared pattern
     bathroom_pattern = r'shared\s+(?:half[-\s]?bath|bathroom|bath)'
@@ -91,27 +115,21 @@ def process_bathroom_counts(df):
         na=False
     )
     fallback_mask = df['bathrooms_text'].isna()
-    
-    shared_fallback = (
-        df['description'].str.contains(
-            bathroom_pattern, 
-            case=False, 
-            na=False, 
-            regex=True
-        )
-        | df['name'].str.contains(
-            bathroom_pattern,
-            case=False,
-            na=False,
-            regex=True
-        )
-        | df['property_type'].str.contains(
-            bathroom_pattern, 
-            case=False, 
-            na=False, 
-            regex=True
-        )
+
+    # The fallback columns only matter where `bathrooms_text` is missing, so
+    # scan just those rows, with the three columns joined into one string.
+    # The '|' separator isn't whitespace, so a match can't span two columns.
+    fallback_rows = df.loc[fallback_mask]
+    fallback_text = (
+        fallback_rows['description'].astype('string').fillna('')
+        + '|' + fallback_rows['name'].astype('string').fillna('')
+        + '|' + fallback_rows['property_type'].astype('string').fillna('')
     )
+    shared_fallback = fallback_text.str.contains(
+        bathroom_pattern,
+        case=False,
+        regex=True
+    ).reindex(df.index, fill_value=False)
 
     # Apply shared status
     df['bathroom_shared'] = pd.Series(pd.NA, dtype='boolean')
@@ -140,9 +158,8 @@ def process_rooms_beds_counts(df):
     -------
     pandas.DataFrame
         DataFrame with cleaned bedroom and bed counts.
+        The input frame is modified in place.
     """
-    df = df.copy()
-
     # Fill bedroom count for Private Rooms
     private_room_mask = df['room_type'].str.contains('private room', case=False, na=False)
 
@@ -188,46 +205,83 @@ def clean_currency(value):
         return float(re.sub(r'[^\d.]', '', value))
     return value
 
+def clean_currency_column(prices):
+    """
+    Vectorized version of `clean_currency` for a whole column.
+
+    Parameters
+    ----------
+    prices : pandas.Series
+        Prices, either currency-formatted strings (e.g., "$1,300") or numbers.
 
+    Returns
+    -------
+    pandas.Series
+        Numeric prices.
+    """
+    if pd.api.types.is_numeric_dtype(prices):
+        return prices
+    stripped = prices.str.replace(r'[^\d.]', '', regex=True)
+    is_text = stripped.notna()
+    return pd.to_numeric(prices.where(~is_text, stripped.where(is_text).astype(float)))
+
+# --- SCHEMA ---
+# Compact dtypes for the columns we keep: low-cardinality text becomes
+# categorical, counts use nullable small ints and review scores float32.
+# Bathrooms stay float64 so text counts like "1.3 baths" keep their value.
+# Free text stays object so an all-missing chunk still supports `.str`.
+LISTING_DTYPES = {
+    'id': 'int64',
+    'listing_url': 'object',
+    'name': 'object',
+    'description': 'object',
+    'picture_url': 'object',
+    'host_name': 'object',
+    'host_identity_verified': 'category',
+    'neighbourhood_cleansed': 'category',
+    'latitude': 'float64',
+    'longitude': 'float64',
+    'property_type': 'category',
+    'room_type': 'category',
+    'accommodates': 'Int16',
+    'bathrooms': 'float64',
+    'bathrooms_text': 'object',
+    'bedrooms': 'float32',
+    'beds': 'float32',
+    'amenities': 'object',
+    'price': 'object',
+    'minimum_nights': 'Int32',
+    'maximum_nights': 'Int64',
+    'number_of_reviews': 'Int32',
+    'review_scores_rating': 'float32',
+    'review_scores_accuracy': 'float32',
+    'review_scores_cleanliness': 'float32',
+    'review_scores_checkin': 'float32',
+    'review_scores_communication': 'float32',
+    'review_scores_location': 'float32',
+    'review_scores_value': 'float32',
+    'instant_bookable': 'category'
+}
+
+TARGET_COLS = list(LISTING_DTYPES)
 
 # --- MAIN PIPELINE ---
-def process_listings(input_path, output_path):
+def clean_listings(listings):
     """
-    Runs the full cleaning pipeline for Airbnb listings data.
+    Applies every cleaning step to a frame of listings (the whole file or one chunk).
 
     Parameters
     ----------
-    input_path : str
-        Path to raw listings CSV file.
-    output_path : str
-        Path where cleaned listings CSV will be saved.
+    listings : pandas.DataFrame
+        Listings restricted to `TARGET_COLS`. Modified in place.
 
     Returns
     -------
-    None
+    pandas.DataFrame
+        The cleaned listings.
     """
-    raw_listings = pd.read_csv(input_path)
-
-    target_cols = [
-        'id', 'listing_url', 'name', 'description', 'picture_url', 'host_name',
-        'host_identity_verified', 'neighbourhood_cleansed', 'latitude', 
-        'longitude', 'property_type', 'room_type', 'accommodates', 'bathrooms',
-        'bathrooms_text', 'bedrooms', 'beds', 'amenities', 'price',
-        'minimum_nights', 'maximum_nights', 'number_of_reviews',
-        'review_scores_rating', 'review_scores_accuracy',
-        'review_scores_cleanliness', 'review_scores_checkin',
-        'review_scores_communication', 'review_scores_location',
-        'review_scores_value', 'instant_bookable'
-    ]
-
-    # Validate schema
-    validate_columns(raw_listings, target_cols)
-
-    # Subset to required columns
-    listings = raw_listings[target_cols].copy()
-
     # Clean price column
-    listings['price'] = listings['price'].apply(clean_currency)
+    listings['price'] = clean_currency_column(listings['price'])
 
     # Process bathrooms
     listings = process_bathroom_counts(listings)
@@ -235,11 +289,44 @@ def process_listings(input_path, output_path):
     # Process bedrooms and beds
     listings = process_rooms_beds_counts(listings)
 
-    # Ensure output directory exists
-    os.makedirs(os.path.dirname(output_path), exist_ok=True)
+    return listings
+
+def process_listings(input_path, output_path, chunksize=None):
+    """
+    Runs the full cleaning pipeline for Airbnb listings data.
+
+    Only `TARGET_COLS` are read from the raw file, with the compact dtypes in
+    `LISTING_DTYPES`. With `chunksize` set, the file is cleaned and written
+    chunk by chunk, so peak memory is a small multiple of one chunk instead of
+    the whole dump.
+
+    Parameters
+    ----------
+    input_path : str
+        Path to raw listings CSV file.
+    output_path : str
+        Path where cleaned listings will be saved. Parquet by default; the
+        format follows the suffix (.parquet, .arrow or .csv).
+    chunksize : int, optional
+        Rows per chunk. The whole file is processed at once when None.
+
+    Returns
+    -------
+    None
+    """
+    # Validate schema from the header alone
+    validate_columns(pd.read_csv(input_path, nrows=0), TARGET_COLS)
+
+    read_kwargs = {"usecols": TARGET_COLS, "dtype": LISTING_DTYPES}
+    if chunksize is None:
+        listings = pd.read_csv(input_path, **read_kwargs)[TARGET_COLS]
+        write_table(clean_listings(listings), output_path)
+        return
 
-    # Save cleaned data
-    listings.to_csv(output_path, index=False)
+    with TableWriter(output_path) as writer:
+        for chunk in pd.read_csv(input_path, chunksize=chunksize, **read_kwargs):
+            # usecols keeps the file's column order; restore ours before writing
+            writer.append(clean_listings(chunk[TARGET_COLS]))
 
 if __name__ == "__main__":
 
@@ -250,19 +337,24 @@ if __name__ == "__main__":
     parser.add_argument(
         "--input", 
         type=str, 
+        default="data/raw/listings/florence_listings_raw.csv",
         help="Path to the raw listing file"
     )
 
     parser.add_argument(
         "--output", 
         type=str, 
+        default="data/processed/listings/listings_cleaned.parquet",
         help="Path to processed listing file"
     )
 
-    args = parser.parse_args()
+    parser.add_argument(
+        "--chunksize",
+        type=int,
+        default=None,
+        help="Rows per chunk; omit to clean the whole file at once"
+    )
 
+    args = parser.parse_args()
 
-    RAW_DATA = "data/raw/listings/florence_listings_raw.csv"
-    PROCESSED_DATA = "data/processed/listings/listings_cleaned.csv"
-    
-    process_listings(RAW_DATA, PROCESSED_DATA)
\ No newline at end of file
+    process_listings(args.input, args.output, chunksize=args.chunksize)
@@ -0,0 +1,66 @@
+import numpy as np
+from typing import List, Optional, Sequence, Tuple
+
+def best_combination(
+    costs: Sequence[Sequence[float]],
+    values: Sequence[Sequence[float]],
+    budget: float
+) -> Optional[Tuple[List[int], float, float]]:
+    """
+    Picks one option per slot (flights, each city's stay, ...) to maximize
+    the total value with a total cost of at most `budget`.
+
+    Slots are combined one at a time with vectorized outer sums. After each
+    step only the Pareto frontier is kept: partial plans that are cheaper
+    *and* at least as valuable as another plan. So the search stays small
+    while the result is still the exact optimum.
+
+    Parameters
+    ----------
+    costs : sequence of sequence of float
+        Cost of every option, one sequence per slot.
+    values : sequence of sequence of float
+        Value of every option, same shape as `costs`. Higher is better.
+    budget : float
+        Upper bound on the summed cost.
+
+    Returns
+    -------
+    tuple of (list of int, float, float) or None
+        Chosen option index per slot, total cost and total value; among
+        equally valuable plans, the cheapest. None when even the cheapest
+        combination is over budget.
+    """
+    costs = [np.asarray(c, dtype=np.float64) for c in costs]
+    values = [np.asarray(v, dtype=np.float64) for v in values]
+
+    # Cheapest possible spend on the slots still to come, for early pruning
+    min_rest = np.concatenate([np.cumsum([c.min() for c in costs][::-1])[::-1], [0.0]])
+    if min_rest[0] > budget:
+        return None
+
+    plan_cost = np.zeros(1)
+    plan_value = np.zeros(1)
+    choices = np.zeros((1, 0), dtype=np.int64)
+    for slot, (slot_costs, slot_values) in enumerate(zip(costs, values)):
+        n_options = slot_costs.size
+        plan_cost = (plan_cost[:, None] + slot_costs[None, :]).ravel()
+        plan_value = (plan_value[:, None] + slot_values[None, :]).ravel()
+        choices = np.hstack([
+            np.repeat(choices, n_options, axis=0),
+            np.tile(np.arange(n_options), len(choices))[:, None]
+        ])
+
+        # Drop plans that can't be completed within budget
+        feasible = plan_cost + min_rest[slot + 1] <= budget
+        plan_cost, plan_value, choices = plan_cost[feasible], plan_value[feasible], choices[feasible]
+
+        # Pareto frontier: by cost (ties: best value first), keep strict value improvements
+        order = np.lexsort((-plan_value, plan_cost))
+        plan_cost, plan_value, choices = plan_cost[order], plan_value[order], choices[order]
+        best_before = np.maximum.accumulate(np.concatenate([[-np.inf], plan_value[:-1]]))
+        keep = plan_value > best_before
+        plan_cost, plan_value, choices = plan_cost[keep], plan_value[keep], choices[keep]
+
+    # The frontier's last plan is the most valuable one, and the cheapest such plan
+    return choices[-1].tolist(), float(plan_cost[-1]), float(plan_value[-1])
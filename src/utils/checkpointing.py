@@ -0,0 +1,103 @@
+import os
+import uuid
+from contextlib import asynccontextmanager, contextmanager
+from typing import Dict, Optional
+
+from langgraph.checkpoint.sqlite import SqliteSaver
+from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
+
+from src.utils.configs import CHECKPOINT_PATH
+
+def new_thread_id() -> str:
+    """
+    Returns a fresh thread id: one per trip request.
+    """
+    return uuid.uuid4().hex
+
+def thread_config(thread_id: str) -> Dict:
+    """
+    Runnable config that points a checkpointed graph at one thread.
+    """
+    return {"configurable": {"thread_id": thread_id}}
+
+def _check_request(snapshot, initial_state: Optional[Dict], thread_id: str):
+    # A thread id reused for a different trip would hand back the old trip's plan
+    saved = snapshot.values.get("request")
+    if initial_state is not None and saved is not None and saved != initial_state.get("request"):
+        raise ValueError(
+            f"Thread {thread_id} belongs to a different request; use a new thread id."
+        )
+
+def _ensure_parent(path: str):
+    parent = os.path.dirname(path)
+    if parent:
+        os.makedirs(parent, exist_ok=True)
+
+@contextmanager
+def open_checkpointer(path: str = CHECKPOINT_PATH):
+    """
+    SQLite checkpointer for `build_graph`, for runs driven by `invoke` / `stream`.
+
+    Parameters
+    ----------
+    path : str
+        SQLite file; shared by every thread (request).
+    """
+    _ensure_parent(path)
+    with SqliteSaver.from_conn_string(path) as saver:
+        yield saver
+
+@asynccontextmanager
+async def open_async_checkpointer(path: str = CHECKPOINT_PATH):
+    """
+    Async version of `open_checkpointer`, for runs driven by `ainvoke` / `astream`.
+    """
+    _ensure_parent(path)
+    async with AsyncSqliteSaver.from_conn_string(path) as saver:
+        yield saver
+
+def run_or_resume(app, initial_state: Optional[Dict], thread_id: str) -> Dict:
+    """
+    Runs a trip request on a checkpointed graph, picking up where the thread
+    left off.
+
+    - A new thread starts from `initial_state`.
+    - A thread that failed or was interrupted resumes after its last
+      completed node; nodes that already succeeded aren't re-run.
+    - A finished thread returns its saved final state without recomputing.
+
+    Returns
+    -------
+    dict
+        The final graph state.
+
+    Raises
+    ------
+    ValueError
+        If the thread was started for a different request text.
+    """
+    config = thread_config(thread_id)
+    snapshot = app.get_state(config)
+    _check_request(snapshot, initial_state, thread_id)
+    if snapshot.next:
+        print(f"↩️ Resuming thread {thread_id} at {', '.join(snapshot.next)}...")
+        return app.invoke(None, config)
+    if snapshot.values:
+        print(f"📦 Thread {thread_id} already finished; returning its saved result.")
+        return snapshot.values
+    return app.invoke(initial_state, config)
+
+async def arun_or_resume(app, initial_state: Optional[Dict], thread_id: str) -> Dict:
+    """
+    Async version of `run_or_resume`; `app` must be compiled with an async checkpointer.
+    """
+    config = thread_config(thread_id)
+    snapshot = await app.aget_state(config)
+    _check_request(snapshot, initial_state, thread_id)
+    if snapshot.next:
+        print(f"↩️ Resuming thread {thread_id} at {', '.join(snapshot.next)}...")
+        return await app.ainvoke(None, config)
+    if snapshot.values:
+        print(f"📦 Thread {thread_id} already finished; returning its saved result.")
+        return snapshot.values
+    return await app.ainvoke(initial_state, config)
@@ -0,0 +1,32 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Awaitable, Callable, Iterable, List, TypeVar
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+def map_in_order(func: Callable[[T], R], items: Iterable[T], max_workers: int) -> List[R]:
+    """
+    Runs `func` over `items` on a bounded thread pool.
+    Results come back in the same order as `items`, regardless of which call finishes first.
+    """
+    items = list(items)
+    if not items:
+        return []
+
+    workers = max(1, min(max_workers, len(items)))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(func, items))
+
+async def amap_in_order(func: Callable[[T], Awaitable[R]], items: Iterable[T], max_concurrency: int) -> List[R]:
+    """
+    Async version of `map_in_order`: awaits `func` over `items` with at most
+    `max_concurrency` calls in flight. Results keep the order of `items`.
+    """
+    semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+    async def bounded(item: T) -> R:
+        async with semaphore:
+            return await func(item)
+
+    return list(await asyncio.gather(*(bounded(item) for item in items)))
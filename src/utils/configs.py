@@ -1,5 +1,64 @@
+import os
 import yaml
 
+# Upper bound on how many cities an agent searches at the same time
+MAX_CITY_CONCURRENCY = int(os.getenv("MAX_CITY_CONCURRENCY", "4"))
+
+# Embedding cache: in-memory LRU size, plus an optional SQLite file for the on-disk tier
+EMBEDDING_MODEL = "text-embedding-3-small"
+EMBEDDING_CACHE_SIZE = int(os.getenv("EMBEDDING_CACHE_SIZE", "10000"))
+EMBEDDING_CACHE_PATH = os.getenv("EMBEDDING_CACHE_PATH")
+
+# LLM response cache: "memory" (per-process LRU) or "sqlite" (shared file at LLM_CACHE_PATH)
+LLM_CACHE_BACKEND = os.getenv("LLM_CACHE_BACKEND", "memory")
+LLM_CACHE_PATH = os.getenv("LLM_CACHE_PATH", "cache/llm_cache.sqlite")
+LLM_CACHE_TTL = float(os.getenv("LLM_CACHE_TTL", str(7 * 24 * 3600)))
+LLM_CACHE_SIZE = int(os.getenv("LLM_CACHE_SIZE", "5000"))
+
+# Tavily result cache TTLs (seconds): fares move quickly, activities barely change
+FLIGHT_SEARCH_TTL = float(os.getenv("FLIGHT_SEARCH_TTL", str(15 * 60)))
+ACTIVITY_SEARCH_TTL = float(os.getenv("ACTIVITY_SEARCH_TTL", str(24 * 3600)))
+SEARCH_CACHE_SIZE = int(os.getenv("SEARCH_CACHE_SIZE", "2000"))
+
+# Index build embedding stage: parallel requests and per-request token budget
+EMBEDDING_MAX_IN_FLIGHT = int(os.getenv("EMBEDDING_MAX_IN_FLIGHT", "4"))
+EMBEDDING_MAX_TOKENS_PER_REQUEST = int(os.getenv("EMBEDDING_MAX_TOKENS_PER_REQUEST", "250000"))
+EMBEDDING_MAX_RETRIES = int(os.getenv("EMBEDDING_MAX_RETRIES", "6"))
+
+# Review summarization worker pool
+SUMMARY_MAX_WORKERS = int(os.getenv("SUMMARY_MAX_WORKERS", "8"))
+SUMMARY_MAX_RETRIES = int(os.getenv("SUMMARY_MAX_RETRIES", "3"))
+
+# Shared cap on OpenAI requests per minute for the data pipeline (0 = no cap)
+OPENAI_REQUESTS_PER_MINUTE = float(os.getenv("OPENAI_REQUESTS_PER_MINUTE", "0"))
+
+# Replanning when a trip comes in over budget: "incremental" re-queries only the
+# component that breaks the budget, "full" re-runs the planner and every search
+REPLAN_MODE = os.getenv("REPLAN_MODE", "incremental")
+# Budget re-checks allowed before returning the best plan found so far
+MAX_REPLAN_ATTEMPTS = int(os.getenv("MAX_REPLAN_ATTEMPTS", "3"))
+# Opt-in: check the committed spend once flights and hotels are in, before
+# searching activities, and stop early when the budget is already out of reach.
+# Saves activity searches on doomed trips, but activities then wait for flights
+# and hotels instead of running alongside them
+EARLY_BUDGET_PRUNING = os.getenv("EARLY_BUDGET_PRUNING", "0") == "1"
+# Share of the total budget set aside for hotels
+HOTEL_BUDGET_SHARE = float(os.getenv("HOTEL_BUDGET_SHARE", "0.6"))
+# Hotel candidates fetched per city for the budget optimizer to choose from
+HOTEL_CANDIDATES_PER_CITY = int(os.getenv("HOTEL_CANDIDATES_PER_CITY", "5"))
+
+# SQLite file holding graph checkpoints (one thread per trip request)
+CHECKPOINT_PATH = os.getenv("CHECKPOINT_PATH", "cache/checkpoints.sqlite")
+# Trip requests in flight at once in batch mode (src/batch.py)
+BATCH_MAX_WORKERS = int(os.getenv("BATCH_MAX_WORKERS", "8"))
+
+# Hotel search backend: "chroma" (default), "numpy" (embedded, memory-mapped matrix)
+# or "hybrid" (numpy + metadata pre-filters and BM25 fusion)
+HOTEL_INDEX_BACKEND = os.getenv("HOTEL_INDEX_BACKEND", "chroma")
+NUMPY_INDEX_PATH = os.getenv("NUMPY_INDEX_PATH", "vector_store/tokyo_listings")
+# Share of the vector similarity in the hybrid score (BM25 gets the rest)
+HYBRID_VECTOR_WEIGHT = float(os.getenv("HYBRID_VECTOR_WEIGHT", "0.7"))
+
 def load_config(path: str) -> dict:
     with open(path, "r") as f:
-        return yaml.safe_load(f)
\ No newline at end of file
+        return yaml.safe_load(f)
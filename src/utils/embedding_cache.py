@@ -0,0 +1,164 @@
+"""Caches text embeddings so repeated texts skip the embeddings API."""
+
+import hashlib
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+from chromadb.utils import embedding_functions
+from dotenv import load_dotenv
+
+from src.utils.configs import EMBEDDING_CACHE_PATH, EMBEDDING_CACHE_SIZE, EMBEDDING_MODEL
+
+load_dotenv()
+
+def normalize_text(text: str) -> str:
+    """
+    Collapses runs of whitespace and trims the ends, so trivially different
+    spellings of the same text share one cache entry.
+    """
+    return " ".join(str(text).split())
+
+class EmbeddingCache:
+    """
+    Two-tier embedding cache keyed by (model, normalized text).
+
+    - Memory tier: an LRU holding up to `max_entries` vectors.
+    - Disk tier (optional): a SQLite file that survives restarts and is shared
+      between the query path and the index builder.
+
+    Parameters
+    ----------
+    embed_fn : callable
+        Takes a list of texts and returns one vector per text (e.g. a Chroma embedding function).
+    model_name : str
+        Embedding model name; part of the cache key.
+    max_entries : int
+        Size of the in-memory LRU tier.
+    disk_path : str, optional
+        SQLite file for the on-disk tier. Disabled when None.
+    """
+
+    def __init__(
+        self,
+        embed_fn: Callable[[List[str]], Sequence],
+        model_name: str,
+        max_entries: int = 10_000,
+        disk_path: Optional[str] = None
+    ):
+        self.embed_fn = embed_fn
+        self.model_name = model_name
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+
+        self._memory: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._disk = None
+        if disk_path:
+            os.makedirs(os.path.dirname(disk_path) or ".", exist_ok=True)
+            self._disk = sqlite3.connect(disk_path, check_same_thread=False)
+            self._disk.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings (key TEXT PRIMARY KEY, vector BLOB)"
+            )
+            self._disk.commit()
+
+    def _key(self, text: str) -> str:
+        return hashlib.sha256(f"{self.model_name}\x00{text}".encode("utf-8")).hexdigest()
+
+    def _get(self, key: str) -> Optional[np.ndarray]:
+        with self._lock:
+            vector = self._memory.get(key)
+            if vector is not None:
+                self._memory.move_to_end(key)
+                return vector
+            if self._disk is None:
+                return None
+            row = self._disk.execute(
+                "SELECT vector FROM embeddings WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None:
+            return None
+        vector = np.frombuffer(row[0], dtype=np.float32)
+        self._remember(key, vector)
+        return vector
+
+    def _remember(self, key: str, vector: np.ndarray):
+        with self._lock:
+            self._memory[key] = vector
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_entries:
+                self._memory.popitem(last=False)
+
+    def _persist(self, entries: Dict[str, np.ndarray]):
+        if self._disk is None or not entries:
+            return
+        with self._lock:
+            self._disk.executemany(
+                "INSERT OR REPLACE INTO embeddings (key, vector) VALUES (?, ?)",
+                [(key, vector.tobytes()) for key, vector in entries.items()]
+            )
+            self._disk.commit()
+
+    def embed(self, texts: Sequence[str]) -> List[np.ndarray]:
+        """
+        Returns one vector per text, calling `embed_fn` only for cache misses.
+        All misses are embedded in a single request.
+        """
+        texts = [normalize_text(text) for text in texts]
+        keys = [self._key(text) for text in texts]
+
+        found: Dict[str, np.ndarray] = {}
+        missing: Dict[str, str] = {}
+        for key, text in zip(keys, texts):
+            if key in found or key in missing:
+                continue
+            vector = self._get(key)
+            if vector is None:
+                missing[key] = text
+            else:
+                found[key] = vector
+
+        with self._lock:
+            self.hits += len(found)
+            self.misses += len(missing)
+
+        if missing:
+            vectors = self.embed_fn(list(missing.values()))
+            fresh = {
+                key: np.asarray(vector, dtype=np.float32)
+                for key, vector in zip(missing.keys(), vectors)
+            }
+            for key, vector in fresh.items():
+                self._remember(key, vector)
+            self._persist(fresh)
+            found.update(fresh)
+
+        return [found[key] for key in keys]
+
+    def stats(self) -> Dict[str, float]:
+        """
+        Hit/miss counters since the cache was created.
+        """
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / total if total else 0.0,
+                "memory_entries": len(self._memory)
+            }
+
+# Shared process-wide cache, used by the hotel search and the index builder
+embedding_cache = EmbeddingCache(
+    embed_fn=embedding_functions.OpenAIEmbeddingFunction(
+        api_key=os.getenv("OPENAI_API_KEY"),
+        model_name=EMBEDDING_MODEL
+    ),
+    model_name=EMBEDDING_MODEL,
+    max_entries=EMBEDDING_CACHE_SIZE,
+    disk_path=EMBEDDING_CACHE_PATH
+)
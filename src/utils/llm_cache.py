@@ -0,0 +1,111 @@
+"""Content-addressed cache for chat completions, shared by every agent and tool."""
+
+import hashlib
+import json
+from typing import Any, Dict, List, Optional
+
+from src.utils.cache import MemoryCache, SQLiteCache
+from src.utils.configs import LLM_CACHE_BACKEND, LLM_CACHE_PATH, LLM_CACHE_SIZE, LLM_CACHE_TTL
+
+class LLMCache:
+    """
+    Caches the text of chat completions.
+
+    The key is a SHA-256 hash of the model, the messages, the response format
+    and any sampling parameters, so identical prompts map to the same entry no
+    matter which agent sends them.
+
+    Parameters
+    ----------
+    backend : MemoryCache or SQLiteCache
+        Where cached completions are stored.
+    ttl : float, optional
+        Seconds a completion stays valid. Never expires when None.
+    """
+
+    def __init__(self, backend, ttl: Optional[float] = None):
+        self.backend = backend
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(
+        model: str,
+        messages: List[Dict],
+        response_format: Optional[Dict] = None,
+        **params: Any
+    ) -> str:
+        payload = json.dumps(
+            {
+                "model": model,
+                "messages": messages,
+                "response_format": response_format,
+                "params": params
+            },
+            sort_keys=True,
+            ensure_ascii=False
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def complete(
+        self,
+        client,
+        model: str,
+        messages: List[Dict],
+        response_format: Optional[Dict] = None,
+        **params: Any
+    ) -> str:
+        """
+        Returns the completion text for the request, calling `client` only on a miss.
+        Accepts the same keyword arguments as `client.chat.completions.create`.
+        """
+        key = self.make_key(model, messages, response_format, **params)
+        cached = self.backend.get(key)
+        if cached is not None:
+            self.hits += 1
+            return cached
+
+        self.misses += 1
+        if response_format is not None:
+            params["response_format"] = response_format
+        response = client.chat.completions.create(model=model, messages=messages, **params)
+        content = response.choices[0].message.content
+        self.backend.set(key, content, ttl=self.ttl)
+        return content
+
+    async def acomplete(
+        self,
+        client,
+        model: str,
+        messages: List[Dict],
+        response_format: Optional[Dict] = None,
+        **params: Any
+    ) -> str:
+        """
+        Async version of `complete`, for an `AsyncOpenAI` client.
+        """
+        key = self.make_key(model, messages, response_format, **params)
+        cached = self.backend.get(key)
+        if cached is not None:
+            self.hits += 1
+            return cached
+
+        self.misses += 1
+        if response_format is not None:
+            params["response_format"] = response_format
+        response = await client.chat.completions.create(model=model, messages=messages, **params)
+        content = response.choices[0].message.content
+        self.backend.set(key, content, ttl=self.ttl)
+        return content
+
+    def stats(self) -> Dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses}
+
+def _default_backend():
+    if LLM_CACHE_BACKEND == "sqlite":
+        return SQLiteCache(LLM_CACHE_PATH, max_entries=LLM_CACHE_SIZE)
+    return MemoryCache(max_entries=LLM_CACHE_SIZE)
+
+# Shared process-wide cache
+llm_cache = LLMCache(_default_backend(), ttl=LLM_CACHE_TTL)
@@ -0,0 +1,46 @@
+"""Token-bucket rate limiter shared by every API-bound stage in a process."""
+
+import threading
+import time
+
+from src.utils.configs import OPENAI_REQUESTS_PER_MINUTE
+
+class RateLimiter:
+    """
+    Thread-safe token bucket.
+
+    Parameters
+    ----------
+    requests_per_minute : float
+        Sustained request rate. A value of 0 or less disables limiting.
+    burst : int, optional
+        Requests that may go out back to back after an idle period.
+        Defaults to one second's worth of requests (at least 1).
+    """
+
+    def __init__(self, requests_per_minute: float, burst: int = None):
+        self.rate = requests_per_minute / 60.0
+        self.capacity = burst if burst is not None else max(1, int(self.rate))
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """
+        Blocks until a request may be sent.
+        """
+        if self.rate <= 0:
+            return
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+# Shared by the review summarizer and the index embedding stage
+openai_rate_limiter = RateLimiter(OPENAI_REQUESTS_PER_MINUTE)
@@ -1,95 +1,416 @@
-"""This module cleans and standardizes Airbnb listings data."""
+"""This module summarizes Airbnb guest reviews for each listing."""
 
+import argparse
+import hashlib
+import heapq
+import json
+import numpy as np
 import pandas as pd
-from openai import OpenAI
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from openai import APIConnectionError, APIStatusError, APITimeoutError, OpenAI, RateLimitError
 from dotenv import load_dotenv
 import os
 import time
+from src.utils.configs import SUMMARY_MAX_RETRIES, SUMMARY_MAX_WORKERS
+from src.utils.llm_cache import llm_cache
+from src.utils.rate_limiter import openai_rate_limiter
+from src.utils.table_io import read_table, write_table
 
 load_dotenv()
 client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
 
-def get_summary_from_llm(reviews_text):
+FALLBACK_SUMMARY = "Review summary unavailable."
+REVIEWS_PER_LISTING = 10
+
+def request_summary(reviews_text):
     """
     Sends a bundle of reviews to OpenAI for a 2-sentence summary.
 
     Parameters
     ----------
-    df : pandas.DataFrame
-        Raw Airbnb listings data.
-    required_cols : list of str
-        Column names required for downstream processing.
+    reviews_text : str
+        Reviews of one listing, joined with " | ".
 
     Raises
     ------
-    ValueError
-        If one or more required columns are missing.
+    openai.OpenAIError
+        If the API call fails.
 
     Returns
     -------
-    None
+    str
+        The summary.
+    """
+    return llm_cache.complete(
+        client,
+        model="gpt-4o-mini",
+        messages=[
+            {
+                "role": "system", 
+                "content": "You are a travel expert. "
+                "Summarize the following guest reviews into two concise "
+                "sentences. Focus on: Cleanliness, Location, and Noise "
+                "levels. Mention one specific Pro and one specific Con "
+                "if they exist."},
+            {
+                "role": "user", 
+                "content": f"Reviews: {reviews_text}"}
+        ],
+        temperature=0,
+        max_tokens=150
+    )
+
+def get_summary_from_llm(reviews_text):
+    """
+    Same as `request_summary`, but returns a placeholder instead of raising.
+
+    Parameters
+    ----------
+    reviews_text : str
+        Reviews of one listing, joined with " | ".
+
+    Returns
+    -------
+    str
+        The summary, or a placeholder if the API call failed.
     """
     try:
-        response = client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[
-                {
-                    "role": "system", 
-                    "content": "You are a travel expert. "
-                    "Summarize the following guest reviews into two concise "
-                    "sentences. Focus on: Cleanliness, Location, and Noise "
-                    "levels. Mention one specific Pro and one specific Con "
-                    "if they exist."},
-                {
-                    "role": "user", 
-                    "content": f"Reviews: {reviews_text}"}
-            ],
-            temperature=0,
-            max_tokens=150
-        )
-        return response.choices[0].message.content
+        return request_summary(reviews_text)
     except Exception as e:
         print(f"Error during API call: {e}")
-        return "Review summary unavailable."
+        return FALLBACK_SUMMARY
+
+def is_transient_error(error):
+    """
+    True for API errors worth retrying: rate limits, connection problems,
+    timeouts and 5xx responses. Anything else (bad request, auth, ...) would
+    fail the same way again.
+    """
+    if isinstance(error, (RateLimitError, APIConnectionError, APITimeoutError)):
+        return True
+    return isinstance(error, APIStatusError) and error.status_code >= 500
+
+def summarize_with_retries(reviews_text, max_retries=SUMMARY_MAX_RETRIES):
+    """
+    Calls `request_summary`, retrying transient API errors with exponential backoff.
 
-def run_summarization(): 
-    # //input_file, output_path):
-    # print("📂 Loading reviews and listings...")
-    reviews = pd.read_csv("data/raw/reviews/florence_reviews.csv")
-    listings = pd.read_csv("data/processed/listings/listings_cleaned.csv")
+    Raises
+    ------
+    Exception
+        Any error that `is_transient_error` rejects, on the first attempt.
 
-    # 2. Sort by date and take the Top 10 per listing
+    Returns
+    -------
+    str or None
+        The summary, or None if every attempt failed.
+    """
+    for attempt in range(max_retries):
+        # Shared with every other API-bound stage running in this process
+        openai_rate_limiter.acquire()
+        try:
+            return request_summary(reviews_text)
+        except Exception as e:
+            if not is_transient_error(e):
+                raise
+            print(f"Error during API call (attempt {attempt + 1}/{max_retries}): {e}")
+            if attempt < max_retries - 1:
+                time.sleep(2 ** attempt)
+    return None
+
+def bundle_hash(reviews_text):
+    """
+    Fingerprints a listing's review bundle; the summary is only stale when this changes.
+    """
+    return hashlib.sha256(str(reviews_text).encode("utf-8")).hexdigest()
+
+def load_summary_store(store_path):
+    """
+    Reads the persistent summary store.
+
+    Parameters
+    ----------
+    store_path : str
+        JSON Lines file, one {"id", "bundle_hash", "review_summary"} record per
+        line. Later records for the same id win.
+
+    Returns
+    -------
+    dict
+        Listing id -> (bundle hash, summary).
+    """
+    store = {}
+    if not os.path.exists(store_path):
+        return store
+    with open(store_path, "r") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                # A crash mid-write can leave a truncated last line
+                continue
+            store[record["id"]] = (record.get("bundle_hash"), record["review_summary"])
+    return store
+
+def compact_summary_store(store_path, store):
+    """
+    Rewrites the store with a single record per listing, dropping superseded lines.
+    """
+    tmp_path = f"{store_path}.tmp"
+    with open(tmp_path, "w") as f:
+        for listing_id, (hash_value, summary) in store.items():
+            f.write(json.dumps({"id": listing_id, "bundle_hash": hash_value, "review_summary": summary}) + "\n")
+    os.replace(tmp_path, store_path)
+
+def summarize_listings(grouped_reviews, store_path, max_workers=SUMMARY_MAX_WORKERS):
+    """
+    Summarizes listings whose reviews changed, on a bounded worker pool.
+
+    Summaries are kept in a persistent store keyed by listing id and the hash
+    of its review bundle. Listings whose bundle matches the stored hash reuse
+    their stored summary; only new or changed bundles are sent to the API.
+
+    Each finished summary is appended to the store straight away, so a
+    crashed run resumes with the listings that are still missing and never
+    pays twice for the same summary. Listings whose retries all fail, or
+    that hit an error not worth retrying (see `is_transient_error`), get the
+    placeholder summary; they are logged, not stored, and get another attempt
+    on the next run. One failing listing doesn't stop the others.
+
+    Parameters
+    ----------
+    grouped_reviews : pandas.DataFrame
+        One row per listing with `listing_id` and concatenated `comments`.
+    store_path : str
+        JSON Lines summary store.
+    max_workers : int
+        Number of summaries requested concurrently.
+
+    Returns
+    -------
+    pandas.DataFrame
+        `id` and `review_summary` for every listing in `grouped_reviews`.
+    """
+    store = load_summary_store(store_path)
+    listing_ids = grouped_reviews['listing_id'].tolist()
+    comments = grouped_reviews['comments'].tolist()
+    hashes = [bundle_hash(text) for text in comments]
+
+    summaries = {}
+    todo = []
+    for listing_id, text, hash_value in zip(listing_ids, comments, hashes):
+        stored = store.get(listing_id)
+        if stored is not None and stored[0] == hash_value:
+            summaries[listing_id] = stored[1]
+        else:
+            todo.append((listing_id, text, hash_value))
+
+    total = len(todo)
+    print(f"📝 {len(summaries)} summaries unchanged, {total} new or changed to summarize.")
+
+    failed = []
+    start = time.perf_counter()
+    os.makedirs(os.path.dirname(store_path) or ".", exist_ok=True)
+    with open(store_path, "a") as store_file, \
+            ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            executor.submit(summarize_with_retries, text): (listing_id, hash_value)
+            for listing_id, text, hash_value in todo
+        }
+        for processed, future in enumerate(as_completed(futures), start=1):
+            listing_id, hash_value = futures[future]
+            try:
+                summary = future.result()
+            except Exception as e:
+                # Not worth retrying (see `is_transient_error`); the other
+                # listings keep going and this one is tried again next run
+                print(f"❌ Listing {listing_id}: summary failed: {e}")
+                failed.append(listing_id)
+                summary = None
+            if summary is None:
+                summary = FALLBACK_SUMMARY
+            else:
+                store_file.write(json.dumps({
+                    "id": listing_id,
+                    "bundle_hash": hash_value,
+                    "review_summary": summary
+                }) + "\n")
+                store_file.flush()
+                store[listing_id] = (hash_value, summary)
+            summaries[listing_id] = summary
+
+            # Simple progress report
+            if processed % 50 == 0 or processed == total:
+                rate = processed / (time.perf_counter() - start)
+                print(f"Processed {processed}/{total} listings ({rate:.1f} listings/sec)...")
+
+    if failed:
+        print(f"⚠️ {len(failed)} listings failed with non-retryable errors; they keep the placeholder summary.")
+    compact_summary_store(store_path, store)
+
+    return pd.DataFrame({"id": list(summaries.keys()), "review_summary": list(summaries.values())})
+
+def group_recent_reviews(reviews, k=REVIEWS_PER_LISTING):
+    """
+    In-memory selection of each listing's `k` most recent reviews.
+
+    Sorts the whole reviews frame, so memory grows with the total number of
+    reviews. Kept as the reference for `stream_recent_reviews`.
+
+    Parameters
+    ----------
+    reviews : pandas.DataFrame
+        Raw reviews with `listing_id`, `date` and `comments`.
+    k : int
+        Reviews kept per listing.
+
+    Returns
+    -------
+    pandas.DataFrame
+        `listing_id` and the `comments` joined with " | ", newest first.
+    """
+    reviews = reviews.copy()
     reviews['date'] = pd.to_datetime(reviews['date'])
     top_reviews = (
         reviews.sort_values('date', ascending=False)
         .groupby('listing_id')
-        .head(10)
+        .head(k)
     )
-
-    # 3. Concatenate reviews for each listing
-    grouped_reviews = top_reviews.groupby('listing_id')['comments'].apply(
+    return top_reviews.groupby('listing_id')['comments'].apply(
         lambda x: " | ".join(str(i) for i in x)
     ).reset_index()
 
-    # 4. Loop and Summarize (Costs API credits. Test with head(5) first)
-    summaries = []
-    
+def stream_recent_reviews(reviews_path, k=REVIEWS_PER_LISTING, chunksize=200_000):
+    """
+    Streaming selection of each listing's `k` most recent reviews.
+
+    The reviews file is read in chunks. Each chunk is trimmed to its own top
+    `k` per listing with vectorized operations, then merged into a per-listing
+    min-heap of size `k`, so memory is proportional to listings x `k` rather
+    than to the total number of reviews. Reviews with the same date are
+    ranked by file order.
+
+    Parameters
+    ----------
+    reviews_path : str
+        Raw reviews CSV with `listing_id`, `date` and `comments`.
+    k : int
+        Reviews kept per listing.
+    chunksize : int
+        Rows read per chunk.
+
+    Returns
+    -------
+    pandas.DataFrame
+        `listing_id` and the `comments` joined with " | ", newest first.
+    """
+    heaps = {}
+    offset = 0
+    for chunk in pd.read_csv(
+        reviews_path,
+        usecols=['listing_id', 'date', 'comments'],
+        chunksize=chunksize
+    ):
+        # Heap entries are (date, -row, comment): the oldest review (then the
+        # latest row in the file) sits on top and is the first to be evicted
+        chunk = chunk.assign(
+            date=pd.to_datetime(chunk['date']).astype('int64'),
+            row=-(np.arange(len(chunk)) + offset)
+        )
+        offset += len(chunk)
+
+        top_chunk = (
+            chunk.sort_values(['date', 'row'], ascending=False)
+            .groupby('listing_id')
+            .head(k)
+        )
+        for listing_id, date, row, comment in zip(
+            top_chunk['listing_id'].tolist(),
+            top_chunk['date'].tolist(),
+            top_chunk['row'].tolist(),
+            top_chunk['comments'].tolist()
+        ):
+            heap = heaps.setdefault(listing_id, [])
+            if len(heap) < k:
+                heapq.heappush(heap, (date, row, comment))
+            elif (date, row) > heap[0][:2]:
+                heapq.heapreplace(heap, (date, row, comment))
+
+    listing_ids = sorted(heaps)
+    return pd.DataFrame({
+        "listing_id": listing_ids,
+        "comments": [
+            " | ".join(str(comment) for _, _, comment in sorted(heaps[listing_id], reverse=True))
+            for listing_id in listing_ids
+        ]
+    })
+
+def attach_summaries(
+    grouped_reviews,
+    listings_path,
+    output_path,
+    store_path="data/processed/review_summaries.jsonl",
+    max_workers=SUMMARY_MAX_WORKERS
+):
+    """
+    Summarizes the selected reviews and merges the summaries into the listings.
+
+    Parameters
+    ----------
+    grouped_reviews : pandas.DataFrame
+        One row per listing with `listing_id` and concatenated `comments`.
+    listings_path : str
+        Cleaned listings file (.parquet, .arrow or .csv).
+    output_path : str
+        Where the listings with a `review_summary` column are saved; the
+        format follows the suffix.
+    store_path : str
+        JSON Lines summary store.
+    max_workers : int
+        Number of summaries requested concurrently.
+
+    Returns
+    -------
+    None
+    """
+    listings = read_table(listings_path)
+
+    # 4. Summarize in parallel (Costs API credits; only new or changed review bundles are billed)
     # We only summarize listings that actually have reviews
-    for index, row in grouped_reviews.head(5).iterrows():
-    # for index, row in grouped_reviews.iterrows():
-        summary = get_summary_from_llm(row['comments'])
-        summaries.append({"id": row['listing_id'], "review_summary": summary})
-        
-        # Simple progress bar
-        if index % 10 == 0:
-            print(f"Processed {index}/{len(grouped_reviews)} listings...")
+    summary_df = summarize_listings(grouped_reviews, store_path=store_path, max_workers=max_workers)
 
     # 5. Merge and Save
-    summary_df = pd.DataFrame(summaries)
     final_df = pd.merge(listings, summary_df, on='id', how='left')
     final_df['review_summary'] = final_df['review_summary'].fillna("No reviews yet.")
     
-    final_df.to_csv("data/processed/listings_with_reviews.csv", index=False)
+    write_table(final_df, output_path)
+
+def run_summarization(
+    reviews_path="data/raw/reviews/florence_reviews.csv",
+    listings_path="data/processed/listings/listings_cleaned.parquet",
+    output_path="data/processed/listings_with_reviews.parquet",
+    store_path="data/processed/review_summaries.jsonl",
+    max_workers=SUMMARY_MAX_WORKERS
+):
+    print("📂 Loading reviews and listings...")
+
+    # 2-3. Keep the Top 10 most recent reviews per listing and concatenate them
+    # (streamed, so memory doesn't grow with the size of the reviews dump)
+    grouped_reviews = stream_recent_reviews(reviews_path)
+
+    attach_summaries(grouped_reviews, listings_path, output_path, store_path, max_workers)
 
 if __name__ == "__main__":
-    run_summarization()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Summarize guest reviews for each listing")
+    parser.add_argument("--reviews", type=str, default="data/raw/reviews/florence_reviews.csv",
+                        help="Path to the raw reviews file")
+    parser.add_argument("--listings", type=str, default="data/processed/listings/listings_cleaned.parquet",
+                        help="Path to the cleaned listings file")
+    parser.add_argument("--output", type=str, default="data/processed/listings_with_reviews.parquet",
+                        help="Path to the listings-with-reviews output file")
+    parser.add_argument("--store", type=str, default="data/processed/review_summaries.jsonl",
+                        help="Path to the persistent summary store")
+    parser.add_argument("--workers", type=int, default=SUMMARY_MAX_WORKERS,
+                        help="Summaries requested concurrently")
+    args = parser.parse_args()
+
+    run_summarization(args.reviews, args.listings, args.output, args.store, args.workers)
@@ -0,0 +1,124 @@
+"""TTL cache with request coalescing for Tavily searches."""
+
+import asyncio
+import hashlib
+import json
+import threading
+from typing import Any, Dict, Optional
+
+from src.utils.cache import MemoryCache
+from src.utils.configs import ACTIVITY_SEARCH_TTL, FLIGHT_SEARCH_TTL, SEARCH_CACHE_SIZE
+
+class _InFlight:
+    """A search that is currently running, shared by every caller asking for it."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Optional[Dict] = None
+        self.error: Optional[BaseException] = None
+
+class SearchCache:
+    """
+    Caches Tavily search results for `ttl` seconds.
+
+    Concurrent identical searches are coalesced (single-flight): the first
+    caller sends the request and every other caller waits for its result
+    instead of sending their own.
+
+    Parameters
+    ----------
+    ttl : float
+        Seconds a search result stays valid.
+    backend : MemoryCache or SQLiteCache, optional
+        Where results are stored. Defaults to an in-memory LRU.
+    """
+
+    def __init__(self, ttl: float, backend=None):
+        self.ttl = ttl
+        self.backend = backend if backend is not None else MemoryCache(max_entries=SEARCH_CACHE_SIZE)
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self._inflight: Dict[str, _InFlight] = {}
+        self._async_inflight: Dict[tuple, asyncio.Task] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(**search_kwargs: Any) -> str:
+        payload = json.dumps(search_kwargs, sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def search(self, client, **search_kwargs: Any) -> Dict:
+        """
+        Returns `client.search(**search_kwargs)`, from the cache when possible.
+        """
+        key = self.make_key(**search_kwargs)
+        cached = self.backend.get(key)
+        if cached is not None:
+            self.hits += 1
+            return cached
+
+        with self._lock:
+            flight = self._inflight.get(key)
+            leader = flight is None
+            if leader:
+                flight = _InFlight()
+                self._inflight[key] = flight
+                self.misses += 1
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+
+        try:
+            flight.result = client.search(**search_kwargs)
+            self.backend.set(key, flight.result, ttl=self.ttl)
+            return flight.result
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+            flight.done.set()
+
+    async def asearch(self, client, **search_kwargs: Any) -> Dict:
+        """
+        Async version of `search`, for an `AsyncTavilyClient`.
+        """
+        key = self.make_key(**search_kwargs)
+        cached = self.backend.get(key)
+        if cached is not None:
+            self.hits += 1
+            return cached
+
+        # Tasks belong to one event loop, so in-flight searches are tracked per loop
+        loop = asyncio.get_running_loop()
+        flight_key = (id(loop), key)
+        task = self._async_inflight.get(flight_key)
+        if task is None:
+            self.misses += 1
+            task = loop.create_task(self._afetch(client, key, search_kwargs))
+            self._async_inflight[flight_key] = task
+            task.add_done_callback(lambda _: self._async_inflight.pop(flight_key, None))
+        else:
+            self.coalesced += 1
+
+        # Shield so one cancelled caller doesn't cancel the search for everyone else
+        return await asyncio.shield(task)
+
+    async def _afetch(self, client, key: str, search_kwargs: Dict) -> Dict:
+        result = await client.search(**search_kwargs)
+        self.backend.set(key, result, ttl=self.ttl)
+        return result
+
+    def stats(self) -> Dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses, "coalesced": self.coalesced}
+
+# One cache per tool, each with its own freshness window
+flight_search_cache = SearchCache(ttl=FLIGHT_SEARCH_TTL)
+activity_search_cache = SearchCache(ttl=ACTIVITY_SEARCH_TTL)
@@ -0,0 +1,155 @@
+"""Reads and writes the tables handed between pipeline stages.
+
+The format follows the file suffix:
+
+- ``.parquet``: the default interchange format. Columnar, compressed, keeps
+  dtypes (categoricals, nullable ints/booleans) and supports column projection.
+- ``.arrow`` / ``.feather``: Arrow IPC, which can be memory-mapped for
+  near-zero-copy loads.
+- ``.csv``: kept as an export option.
+"""
+
+import os
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.ipc as ipc
+import pyarrow.parquet as pq
+
+PARQUET_SUFFIXES = (".parquet", ".pq")
+ARROW_SUFFIXES = (".arrow", ".feather", ".ipc")
+
+def _suffix(path):
+    return os.path.splitext(path)[1].lower()
+
+def read_table(path, columns=None, memory_map=False):
+    """
+    Loads a table written by `write_table` (or any CSV).
+
+    Parameters
+    ----------
+    path : str
+        File to read; the format follows its suffix.
+    columns : list of str, optional
+        Only read these columns. Parquet and Arrow skip the others entirely.
+    memory_map : bool
+        Memory-map the file instead of reading it into memory (Parquet/Arrow).
+
+    Returns
+    -------
+    pandas.DataFrame
+    """
+    suffix = _suffix(path)
+    if suffix in PARQUET_SUFFIXES:
+        return pd.read_parquet(path, columns=columns, memory_map=memory_map)
+    if suffix in ARROW_SUFFIXES:
+        source = pa.memory_map(path, "r") if memory_map else pa.OSFile(path, "rb")
+        with source:
+            table = ipc.open_file(source).read_all()
+        if columns is not None:
+            table = table.select(columns)
+        return table.to_pandas()
+    return pd.read_csv(path, usecols=columns)
+
+def iter_table_batches(path, batch_size, columns=None):
+    """
+    Streams a table in DataFrames of at most `batch_size` rows.
+
+    Parameters
+    ----------
+    path : str
+        File to read; the format follows its suffix.
+    batch_size : int
+        Rows per batch.
+    columns : list of str, optional
+        Only read these columns.
+    """
+    suffix = _suffix(path)
+    if suffix in PARQUET_SUFFIXES:
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=batch_size, columns=columns):
+            yield batch.to_pandas()
+    elif suffix in ARROW_SUFFIXES:
+        with pa.memory_map(path, "r") as source:
+            reader = ipc.open_file(source)
+            for i in range(reader.num_record_batches):
+                batch = reader.get_batch(i)
+                if columns is not None:
+                    batch = batch.select(columns)
+                for start in range(0, batch.num_rows, batch_size):
+                    yield batch.slice(start, batch_size).to_pandas()
+    else:
+        yield from pd.read_csv(path, usecols=columns, chunksize=batch_size)
+
+def write_table(df, path):
+    """
+    Saves `df` in the format given by the suffix of `path`, creating its directory.
+    """
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    suffix = _suffix(path)
+    if suffix in PARQUET_SUFFIXES:
+        df.to_parquet(path, index=False)
+    elif suffix in ARROW_SUFFIXES:
+        df.reset_index(drop=True).to_feather(path)
+    else:
+        df.to_csv(path, index=False)
+
+def _stable_schema(schema, dictionaries=True):
+    # Chunks must share one schema: widen dictionary indices so later chunks
+    # with more categories still fit, and type columns that were all-null
+    # in the first chunk as strings. IPC files allow a single dictionary per
+    # column for the whole file, so with `dictionaries=False` categorical
+    # columns are stored as their plain values instead
+    fields = []
+    for f in schema:
+        if pa.types.is_dictionary(f.type):
+            if dictionaries:
+                f = f.with_type(pa.dictionary(pa.int32(), f.type.value_type))
+            else:
+                f = f.with_type(f.type.value_type)
+        elif pa.types.is_null(f.type):
+            f = f.with_type(pa.string())
+        fields.append(f)
+    return pa.schema(fields, metadata=schema.metadata)
+
+class TableWriter:
+    """
+    Appends DataFrame chunks to a single output file, in the format given by
+    the suffix of `path`. Use as a context manager.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.suffix = _suffix(path)
+        self._writer = None
+        self._schema = None
+        self._sink = None
+        self._rows = 0
+
+    def __enter__(self):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        return self
+
+    def append(self, df):
+        if self.suffix in PARQUET_SUFFIXES or self.suffix in ARROW_SUFFIXES:
+            if self._schema is None:
+                self._schema = _stable_schema(
+                    pa.Schema.from_pandas(df, preserve_index=False),
+                    dictionaries=self.suffix in PARQUET_SUFFIXES
+                )
+                if self.suffix in PARQUET_SUFFIXES:
+                    self._writer = pq.ParquetWriter(self.path, self._schema)
+                else:
+                    self._sink = pa.OSFile(self.path, "wb")
+                    self._writer = ipc.new_file(self._sink, self._schema)
+            table = pa.Table.from_pandas(df, schema=self._schema, preserve_index=False)
+            self._writer.write_table(table)
+        else:
+            df.to_csv(self.path, mode="w" if self._rows == 0 else "a", header=self._rows == 0, index=False)
+        self._rows += len(df)
+
+    def __exit__(self, *exc_info):
+        if self._writer is not None:
+            self._writer.close()
+        if self._sink is not None:
+            self._sink.close()
+        return False
@@ -0,0 +1,5 @@
+import os
+
+# API clients are created at import time; tests never reach the network
+os.environ.setdefault("OPENAI_API_KEY", "test")
+os.environ.setdefault("TAVILY_API_KEY", "test")
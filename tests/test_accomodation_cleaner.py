@@ -0,0 +1,87 @@
+"""Vectorized listing cleaners vs. their per-value counterparts, on synthetic rows."""
+
+import io
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.utils.accomodation_cleaner import (
+    LISTING_DTYPES,
+    clean_currency,
+    clean_currency_column,
+    parse_bathrooms,
+    process_bathroom_counts,
+)
+
+BATHROOM_PATTERN = r'shared\s+(?:half[-\s]?bath|bathroom|bath)'
+
+def make_bathroom_rows(dtype):
+    return pd.DataFrame({
+        "bathrooms": pd.Series([np.nan, 2.0, np.nan, np.nan, np.nan, np.nan, np.nan, np.nan], dtype=dtype),
+        "bathrooms_text": [
+            "1.3 baths", "2 baths", "Half-bath", "Shared half-bath",
+            "2.7 shared baths", "no bath info", None, None
+        ],
+        "description": [None, None, None, None, None, None, "Room with a shared bathroom", "Quiet flat"],
+        "name": ["Loft", "Flat", "Room", "Room", "Room", "Studio", None, "Room w/ Shared Bath"],
+        "property_type": ["Entire loft"] * 6 + [None, "Private room"],
+    })
+
+def scalar_bathroom_counts(df):
+    """Row-by-row reference: `parse_bathrooms` per value, shared flag per row."""
+    expected = df.copy()
+    counts = [
+        count if not pd.isna(count) else parse_bathrooms(text)
+        for count, text in zip(df["bathrooms"], df["bathrooms_text"])
+    ]
+    expected["bathrooms"] = pd.Series(counts, index=df.index, dtype="float64").astype(df["bathrooms"].dtype)
+
+    def shared(row):
+        if not pd.isna(row["bathrooms_text"]):
+            return bool(pd.Series([row["bathrooms_text"]]).str.contains(BATHROOM_PATTERN, case=False).iloc[0])
+        fallback = [row[col] for col in ("description", "name", "property_type") if not pd.isna(row[col])]
+        if pd.Series(fallback, dtype=object).str.contains(BATHROOM_PATTERN, case=False).any():
+            return True
+        return pd.NA
+
+    expected["bathroom_shared"] = pd.Series([shared(row) for _, row in df.iterrows()], index=df.index, dtype="boolean")
+    return expected
+
+@pytest.mark.parametrize("dtype", ["float64", "float32"])
+def test_process_bathroom_counts_matches_scalar(dtype):
+    rows = make_bathroom_rows(dtype)
+    expected = scalar_bathroom_counts(rows)
+
+    result = process_bathroom_counts(rows.copy())
+
+    pd.testing.assert_frame_equal(result, expected)
+    assert result["bathrooms"].dtype == dtype
+
+def test_process_bathroom_counts_with_listing_dtypes():
+    # The pipeline path: columns read from CSV with the schema's dtypes
+    csv = (
+        "bathrooms,bathrooms_text,description,name,property_type\n"
+        ",1.3 baths,,Loft,Entire loft\n"
+        ",2.7 shared baths,,Room,Private room\n"
+        "1,1 bath,,Flat,Entire rental unit\n"
+    )
+    dtypes = {col: LISTING_DTYPES[col] for col in ("bathrooms", "bathrooms_text", "description", "name", "property_type")}
+    rows = pd.read_csv(io.StringIO(csv), dtype=dtypes)
+
+    result = process_bathroom_counts(rows)
+
+    assert result["bathrooms"].tolist() == [1.3, 2.7, 1.0]
+    assert result["bathroom_shared"].tolist() == [False, True, False]
+
+def test_clean_currency_column_matches_scalar():
+    prices = pd.Series(["$1,300.00", "$85.00", np.nan, "$12,000", "€45.50"], dtype=object)
+
+    expected = pd.to_numeric(prices.map(clean_currency))
+
+    pd.testing.assert_series_equal(clean_currency_column(prices), expected)
+
+def test_clean_currency_column_leaves_numbers_alone():
+    prices = pd.Series([1300.0, np.nan, 85.5], dtype="float32")
+
+    pd.testing.assert_series_equal(clean_currency_column(prices), prices)
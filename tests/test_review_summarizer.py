@@ -0,0 +1,50 @@
+"""`summarize_listings` with the OpenAI call replaced by a counting fake."""
+
+import json
+import threading
+
+import httpx
+import openai
+import pandas as pd
+
+from src.utils import review_summarizer
+from src.utils.review_summarizer import FALLBACK_SUMMARY, summarize_listings
+
+def bad_request():
+    request = httpx.Request("POST", "https://api.openai.com/v1/chat/completions")
+    return openai.BadRequestError("bad request", response=httpx.Response(400, request=request), body=None)
+
+def test_one_failing_listing_does_not_stop_the_others(tmp_path, monkeypatch):
+    calls = []
+    lock = threading.Lock()
+
+    def fake_request_summary(reviews_text):
+        with lock:
+            calls.append(reviews_text)
+        if reviews_text == "reviews 7":
+            raise bad_request()
+        return f"summary of {reviews_text}"
+
+    monkeypatch.setattr(review_summarizer, "request_summary", fake_request_summary)
+    grouped = pd.DataFrame({
+        "listing_id": list(range(50)),
+        "comments": [f"reviews {i}" for i in range(50)]
+    })
+    store_path = tmp_path / "summaries.jsonl"
+
+    result = summarize_listings(grouped, str(store_path), max_workers=4)
+
+    # Non-transient errors aren't retried: one call per listing
+    assert len(calls) == 50
+    stored = [json.loads(line) for line in store_path.read_text().splitlines()]
+    assert len(stored) == 49
+    assert 7 not in {record["id"] for record in stored}
+
+    summaries = dict(zip(result["id"], result["review_summary"]))
+    assert summaries[7] == FALLBACK_SUMMARY
+    assert summaries[8] == "summary of reviews 8"
+
+    # The failed listing is the only one sent again on the next run
+    calls.clear()
+    summarize_listings(grouped, str(store_path), max_workers=4)
+    assert calls == ["reviews 7"]